@@ -2,8 +2,10 @@
 Application configuration using Pydantic Settings.
 Loads environment variables and provides type-safe configuration.
 """
-from pydantic_settings import BaseSettings
-from typing import Optional
+from functools import lru_cache
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import FrozenSet, Optional
 
 
 class Settings(BaseSettings):
@@ -29,11 +31,22 @@ class Settings(BaseSettings):
     # File Upload
     UPLOAD_DIR: str = "./uploads"
     MAX_FILE_SIZE: int = 5 * 1024 * 1024  # 5MB
-    ALLOWED_EXTENSIONS: set = {".pdf", ".doc", ".docx"}
+    ALLOWED_EXTENSIONS: FrozenSet[str] = frozenset({".pdf", ".doc", ".docx"})
+    RESUME_PARSER_WORKERS: int = 2  # Parser processes per app worker (0 = threadpool)
+    RESUME_PARSE_TIMEOUT: int = 300  # Seconds before a pending resume is parsed again at startup
     
     # AI Models
     SPACY_MODEL: str = "en_core_web_sm"
     SENTENCE_TRANSFORMER_MODEL: str = "all-MiniLM-L6-v2"
+    SENTENCE_TRANSFORMER_BACKEND: str = "onnx"  # "onnx" or "torch"
+    SENTENCE_TRANSFORMER_ONNX_FILE: str = "onnx/model_qint8_avx512_vnni.onnx"
+    SENTENCE_TRANSFORMER_THREADS: int = 0  # Inference threads, ONNX Runtime or PyTorch (0 = one per core)
+    USE_FP16: bool = True  # Run the PyTorch backend in fp16 on CUDA
+    EMBEDDING_DIMENSION: int = 384  # Output size of SENTENCE_TRANSFORMER_MODEL
+    EMBEDDING_CACHE_SIZE: int = 10_000  # Texts whose int8 embeddings are kept in memory
+    # Nearest jobs by embedding fully scored per request (0 = all); at most
+    # 1000, pgvector's hnsw.ef_search limit
+    MATCH_CANDIDATES: int = Field(500, ge=0, le=1000)
     
     # AWS S3 (Optional)
     AWS_ACCESS_KEY_ID: Optional[str] = None
@@ -42,10 +55,19 @@ class Settings(BaseSettings):
     AWS_REGION: str = "us-east-1"
     USE_S3: bool = False
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the cached application settings.
+    
+    The environment and .env file are parsed once per process. Use as a
+    FastAPI dependency so it can be replaced via app.dependency_overrides.
+    """
+    return Settings()
 
 
 # Global settings instance
-settings = Settings()
+settings = get_settings()
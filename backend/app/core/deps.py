@@ -0,0 +1,18 @@
+"""
+Shared FastAPI dependency aliases for route signatures.
+"""
+from typing import Annotated
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import get_current_user
+from app.db.database import get_db
+from app.models.user import User
+
+
+# Authenticated user for the current request
+CurrentUser = Annotated[User, Depends(get_current_user)]
+
+# Database session for the current request (shared with get_current_user)
+DBSession = Annotated[AsyncSession, Depends(get_db)]
@@ -1,34 +1,89 @@
 """
 Security utilities for JWT authentication and password hashing.
 """
+import re
+import time
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from typing import Optional, Dict, Any, Tuple
+import bcrypt
+import jwt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.db.database import get_db
 from app.models.user import User
 
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hasher: new hashes use Argon2id, existing bcrypt hashes still
+# verify and are upgraded on the next successful login.
+# Hashing is CPU-bound, so the helpers below run it in the threadpool
+# to keep the event loop free.
+password_hasher = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=2)
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
 
+# Recently verified token payloads, keyed by the raw token
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plain password against a hashed password."""
-    return pwd_context.verify(plain_password, hashed_password)
+# Recently loaded users, keyed by user id (detached from their session)
+_user_cache: TTLCache = TTLCache(maxsize=1000, ttl=5)
 
+# Characters accepted as "special" by the password strength check
+SPECIAL_CHARS = frozenset("!@#$%^&*()_+-=[]{}|;:,.<>?")
 
-def get_password_hash(password: str) -> str:
-    """Hash a password using bcrypt."""
-    return pwd_context.hash(password)
+# Longer passwords are rejected before any scanning (bcrypt only uses 72 bytes)
+MAX_PASSWORD_LENGTH = 128
+
+# Fast path for the strength check: all rules in one compiled pattern
+_PASSWORD_RE = re.compile(
+    r"(?=.*[A-Z])(?=.*[a-z])(?=.*\d)(?=.*[" + re.escape("".join(sorted(SPECIAL_CHARS))) + r"]).{8,}",
+    re.DOTALL,
+)
+
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password against an Argon2id or legacy bcrypt hash."""
+    if hashed_password.startswith("$2"):
+        # Legacy bcrypt hash: always upgrade to Argon2id once verified
+        if bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8")):
+            return True, password_hasher.hash(plain_password)
+        return False, None
+    
+    try:
+        password_hasher.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False, None
+    
+    if password_hasher.check_needs_rehash(hashed_password):
+        return True, password_hasher.hash(plain_password)
+    return True, None
+
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and check whether its hash should be upgraded.
+    
+    Args:
+        plain_password: Password supplied by the user
+        hashed_password: Stored password hash
+        
+    Returns:
+        Tuple of (verified, new_hash); new_hash is set when the stored hash
+        is a legacy bcrypt hash or uses outdated Argon2 parameters
+    """
+    return await run_in_threadpool(_verify_and_update, plain_password, hashed_password)
+
+
+async def get_password_hash(password: str) -> str:
+    """Hash a password using Argon2id."""
+    return await run_in_threadpool(password_hasher.hash, password)
 
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
@@ -86,20 +141,28 @@ def decode_token(token: str) -> Dict[str, Any]:
     Raises:
         HTTPException: If token is invalid or expired
     """
+    # Skip signature verification for tokens seen recently, as long as
+    # they have not expired in the meantime
+    payload = _token_cache.get(token)
+    if payload is not None and payload.get("exp", 0) > time.time():
+        return payload
+    
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
-    except JWTError:
+    except jwt.PyJWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    
+    _token_cache[token] = payload
+    return payload
 
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> User:
     """
     Dependency to get the current authenticated user from JWT token.
@@ -124,13 +187,22 @@ async def get_current_user(
             detail="Could not validate credentials",
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
+    # Reuse a recently loaded user to save a query on chatty clients
+    user = _user_cache.get(user_id)
+    if user is not None:
+        return user
+    
+    user = await db.get(User, user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
     
+    # Detach so commits in this or later sessions don't expire its attributes
+    db.expunge(user)
+    _user_cache[user_id] = user
+    
     return user
 
 
@@ -139,7 +211,7 @@ def validate_password_strength(password: str) -> bool:
     Validate password meets security requirements.
     
     Requirements:
-    - Minimum 8 characters
+    - Between 8 and 128 characters
     - At least one uppercase letter
     - At least one lowercase letter
     - At least one digit
@@ -154,35 +226,42 @@ def validate_password_strength(password: str) -> bool:
     Raises:
         HTTPException: If password doesn't meet requirements
     """
-    if len(password) < 8:
+    if len(password) > MAX_PASSWORD_LENGTH:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Password must be at least 8 characters long"
+            detail=f"Password must be at most {MAX_PASSWORD_LENGTH} characters long"
         )
     
-    if not any(c.isupper() for c in password):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Password must contain at least one uppercase letter"
-        )
+    if _PASSWORD_RE.fullmatch(password):
+        return True
     
-    if not any(c.islower() for c in password):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Password must contain at least one lowercase letter"
-        )
+    # Slow path: classify every character in a single pass to find the
+    # failing rule (also accepts non-ASCII letters the pattern doesn't)
+    has_upper = has_lower = has_digit = has_special = False
+    for c in password:
+        if c.isupper():
+            has_upper = True
+        elif c.islower():
+            has_lower = True
+        elif c.isdigit():
+            has_digit = True
+        elif c in SPECIAL_CHARS:
+            has_special = True
     
-    if not any(c.isdigit() for c in password):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Password must contain at least one digit"
-        )
-    
-    special_chars = "!@#$%^&*()_+-=[]{}|;:,.<>?"
-    if not any(c in special_chars for c in password):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Password must contain at least one special character"
-        )
+    if len(password) < 8:
+        detail = "Password must be at least 8 characters long"
+    elif not has_upper:
+        detail = "Password must contain at least one uppercase letter"
+    elif not has_lower:
+        detail = "Password must contain at least one lowercase letter"
+    elif not has_digit:
+        detail = "Password must contain at least one digit"
+    elif not has_special:
+        detail = "Password must contain at least one special character"
+    else:
+        return True
     
-    return True
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=detail
+    )
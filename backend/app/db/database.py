@@ -1,52 +1,122 @@
 """
 Database configuration and session management using SQLAlchemy.
 """
-from sqlalchemy import create_engine
+import os
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import AsyncGenerator
 
 from app.core.config import settings
 
 
-# Create SQLAlchemy engine
-engine = create_engine(
-    settings.DATABASE_URL,
+def _async_database_url() -> URL:
+    """Point DATABASE_URL at the asyncpg driver."""
+    url = make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg")
+    
+    # asyncpg spells libpq's sslmode parameter "ssl"
+    if "sslmode" in url.query:
+        url = url.update_query_dict({"ssl": url.query["sslmode"]}).difference_update_query(["sslmode"])
+    
+    return url
+
+
+# Create async SQLAlchemy engine on the asyncpg driver
+engine = create_async_engine(
+    _async_database_url(),
     pool_pre_ping=True,  # Verify connections before using
-    pool_size=10,  # Connection pool size
+    pool_size=20,  # Connection pool size
     max_overflow=20,  # Max connections beyond pool_size
+    pool_recycle=300,  # Replace connections older than 5 minutes
 )
 
-# Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Create SessionLocal class; objects stay usable after commit since
+# async sessions cannot lazily reload expired attributes
+SessionLocal = async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
 # Base class for models
 Base = declarative_base()
 
+# Alembic configuration for the schema migrations (backend/alembic.ini)
+ALEMBIC_CONFIG = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "alembic.ini")
+
+# Advisory lock key that serializes startup work across uvicorn workers
+STARTUP_LOCK_KEY = 7_105_271
+
+# First half of the two-part advisory lock keys for stored files; the
+# second half is a hash of the path
+FILE_LOCK_KEY = 7_105_272
+
+
+async def acquire_startup_lock(bind) -> None:
+    """
+    Take the startup advisory lock for the current transaction.
+    
+    Args:
+        bind: AsyncConnection or AsyncSession to lock on; the lock is released
+            when its transaction ends
+    """
+    await bind.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": STARTUP_LOCK_KEY})
+
 
-def get_db() -> Generator[Session, None, None]:
+async def acquire_file_lock(bind, file_path: str) -> None:
+    """
+    Take the advisory lock for a stored file for the current transaction.
+    
+    Uploads and deletes that share a stored file hold it while they decide
+    whether to write or remove the file, until they commit.
+    
+    Args:
+        bind: AsyncConnection or AsyncSession to lock on; the lock is released
+            when its transaction ends
+        file_path: Path of the stored file
+    """
+    await bind.execute(
+        text("SELECT pg_advisory_xact_lock(:key, hashtext(:file_path))"),
+        {"key": FILE_LOCK_KEY, "file_path": file_path}
+    )
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency function to get database session.
     
     Yields:
-        Database session
+        Async database session
         
     Usage:
         @app.get("/items")
-        def get_items(db: Session = Depends(get_db)):
-            return db.query(Item).all()
+        async def get_items(db: AsyncSession = Depends(get_db)):
+            return (await db.scalars(select(Item))).all()
     """
-    db = SessionLocal()
-    try:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-def init_db() -> None:
+def _upgrade_schema(connection) -> None:
+    """Run the Alembic migrations up to head on a sync connection."""
+    from alembic import command
+    from alembic.config import Config
+    
+    config = Config(ALEMBIC_CONFIG)
+    config.attributes["connection"] = connection
+    
+    # Databases created with create_all before there were migrations hold
+    # the initial schema; record that rather than creating it again
+    inspector = inspect(connection)
+    if inspector.has_table("users") and not inspector.has_table("alembic_version"):
+        command.stamp(config, "0001")
+    
+    command.upgrade(config, "head")
+
+
+async def init_db() -> None:
     """
-    Initialize database by creating all tables.
+    Bring the database schema up to date by running the migrations.
     Should be called on application startup.
     """
-    from app.models import user, resume, job, match, application
-    Base.metadata.create_all(bind=engine)
+    # Every worker runs this on startup, so only one migrates at a time
+    async with engine.begin() as conn:
+        await acquire_startup_lock(conn)
+        await conn.run_sync(_upgrade_schema)
@@ -1,13 +1,18 @@
 """
 Main FastAPI application entry point.
 """
-from fastapi import FastAPI
+import asyncio
+import os
+from anyio import to_thread
+from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 
-from app.core.config import settings
-from app.db.database import init_db
+from app.core.config import Settings, settings, get_settings
+from app.db.database import SessionLocal, init_db
 from app.routes import auth, resumes, preferences, jobs, applications
+from app.services.resume_parser import create_parser_pool
 
 
 @asynccontextmanager
@@ -15,10 +20,23 @@ async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
     print("🚀 Starting JobSync API...")
-    init_db()
+    # Bound the threadpool used for blocking work such as password hashing
+    limiter = to_thread.current_default_thread_limiter()
+    limiter.total_tokens = min(64, (os.cpu_count() or 1) * 4)
+    # Resume parsing is CPU-bound Python, so it runs in worker processes
+    app.state.parser_pool = create_parser_pool()
+    await init_db()
     print("✅ Database initialized")
+    async with SessionLocal() as db:
+        await jobs.seed_jobs_if_empty(db)
+    await resumes.ensure_upload_dir()
+    # Pick up parses lost to a restart without delaying startup
+    requeue_task = asyncio.create_task(resumes.requeue_stale_resumes(app.state))
     yield
     # Shutdown
+    requeue_task.cancel()
+    if app.state.parser_pool is not None:
+        app.state.parser_pool.shutdown()
     print("👋 Shutting down JobSync API...")
 
 
@@ -27,6 +45,7 @@ app = FastAPI(
     title=settings.APP_NAME,
     version=settings.VERSION,
     description="AI-powered job matching platform API",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -48,11 +67,11 @@ app.include_router(applications.router)
 
 
 @app.get("/")
-async def root():
+async def root(app_settings: Settings = Depends(get_settings)):
     """Root endpoint - API health check."""
     return {
         "message": "Welcome to JobSync API",
-        "version": settings.VERSION,
+        "version": app_settings.VERSION,
         "status": "running"
     }
 
@@ -69,5 +88,8 @@ if __name__ == "__main__":
         "app.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=settings.DEBUG
+        reload=settings.DEBUG,
+        loop="uvloop",
+        http="httptools",
+        workers=1 if settings.DEBUG else os.cpu_count()
     )
@@ -2,11 +2,13 @@
 Job model for storing job listings.
 """
 import uuid
-from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
+from pgvector.sqlalchemy import Vector
 from datetime import datetime
 
+from app.core.config import settings
 from app.db.database import Base
 
 
@@ -14,6 +16,16 @@ class Job(Base):
     """Job listing model."""
     
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Approximate nearest-neighbor search over embeddings by cosine distance
+        Index(
+            "ix_jobs_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"}
+        ),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String, nullable=False, index=True)
@@ -27,6 +39,7 @@ class Job(Base):
     source = Column(String)  # e.g., "Adzuna", "Mock", "LinkedIn"
     external_url = Column(String)  # Link to original job posting
     posted_at = Column(DateTime, index=True)
+    embedding = deferred(Column(Vector(settings.EMBEDDING_DIMENSION)))  # Normalized description embedding
     scraped_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
     # Relationships
@@ -2,7 +2,7 @@
 Match model for storing AI-generated job match scores.
 """
 import uuid
-from sqlalchemy import Column, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Float, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -14,6 +14,10 @@ class Match(Base):
     """Job match score model."""
     
     __tablename__ = "matches"
+    __table_args__ = (
+        UniqueConstraint("user_id", "job_id", name="uq_matches_user_job"),
+        Index("ix_matches_user_job_calculated", "user_id", "job_id", "calculated_at"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
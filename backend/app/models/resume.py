@@ -2,7 +2,7 @@
 Resume model for storing uploaded resumes and parsed data.
 """
 import uuid
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -14,12 +14,18 @@ class Resume(Base):
     """Resume model for storing uploaded resumes."""
     
     __tablename__ = "resumes"
+    __table_args__ = (
+        UniqueConstraint("user_id", "content_sha256", name="uq_resumes_user_sha256"),
+        Index("ix_resumes_user_uploaded", "user_id", "uploaded_at"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     file_url = Column(String, nullable=False)  # S3 URL or local path
+    content_sha256 = Column(String(64), index=True)  # Hex digest of the uploaded file
     raw_text = Column(Text)  # Extracted text from PDF
     parsed_data = Column(JSONB)  # Structured data: skills, experience, education
+    parse_status = Column(String, default="pending", nullable=False)  # pending, parsed, failed
     uploaded_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
     # Relationships
@@ -59,8 +65,8 @@ class Preference(Base):
     desired_skills = Column(JSONB)  # List of desired skills
     experience_level = Column(String)  # e.g., "Entry", "Mid", "Senior"
     location = Column(String)
-    min_salary = Column(String)
-    max_salary = Column(String)
+    min_salary = Column(Integer)
+    max_salary = Column(Integer)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
     # Relationships
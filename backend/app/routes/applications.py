@@ -1,14 +1,14 @@
 """
 Application routes for tracking job applications.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, status
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 from typing import List
 
-from app.core.security import get_current_user
-from app.db.database import get_db
-from app.models.user import User
-from app.models.job import Job
+from app.core.deps import CurrentUser, DBSession
 from app.models.application import Application
 from app.schemas import ApplicationCreate, ApplicationUpdate, ApplicationResponse
 
@@ -19,79 +19,80 @@ router = APIRouter(prefix="/api/applications", tags=["Applications"])
 @router.post("", response_model=ApplicationResponse, status_code=status.HTTP_201_CREATED)
 async def create_application(
     app_data: ApplicationCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser,
+    db: DBSession
 ):
     """
     Submit a job application.
     
     Marks a job as applied and tracks the application status.
     """
-    # Check if job exists
-    job = db.query(Job).filter(Job.id == app_data.job_id).first()
-    if not job:
+    # Insert in one round trip; the unique (user_id, job_id) constraint
+    # rejects duplicates and the job foreign key rejects unknown jobs
+    stmt = pg_insert(Application).values(
+        user_id=current_user.id,
+        job_id=app_data.job_id,
+        status="applied"
+    ).on_conflict_do_nothing(constraint="uq_applications_user_job").returning(Application)
+    
+    try:
+        application = await db.scalar(stmt)
+    except IntegrityError:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Job not found"
         )
     
-    # Check if already applied
-    existing_app = db.query(Application).filter(
-        Application.user_id == current_user.id,
-        Application.job_id == app_data.job_id
-    ).first()
-    
-    if existing_app:
+    if application is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="You have already applied to this job"
         )
     
-    # Create application
-    application = Application(
-        user_id=current_user.id,
-        job_id=app_data.job_id,
-        status="applied"
-    )
+    await db.commit()
     
-    db.add(application)
-    db.commit()
-    db.refresh(application)
+    # The response embeds the job, which can't be lazy-loaded in async
+    await db.refresh(application, ["job"])
     
     return application
 
 
 @router.get("", response_model=List[ApplicationResponse])
 async def get_applications(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser,
+    db: DBSession
 ):
     """
     Get all job applications for the current user.
     """
-    applications = db.query(Application).filter(
-        Application.user_id == current_user.id
-    ).order_by(Application.applied_at.desc()).all()
+    applications = await db.scalars(
+        select(Application).options(selectinload(Application.job)).where(
+            Application.user_id == current_user.id
+        ).order_by(Application.applied_at.desc())
+    )
     
-    return applications
+    return applications.all()
 
 
 @router.patch("/{application_id}", response_model=ApplicationResponse)
 async def update_application(
     application_id: str,
     update_data: ApplicationUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser,
+    db: DBSession
 ):
     """
     Update application status.
     
     Valid statuses: applied, interviewing, rejected, accepted
     """
-    application = db.query(Application).filter(
-        Application.id == application_id,
-        Application.user_id == current_user.id
-    ).first()
+    application = await db.scalar(
+        select(Application).options(selectinload(Application.job)).where(
+            Application.id == application_id,
+            Application.user_id == current_user.id
+        )
+    )
     
     if not application:
         raise HTTPException(
@@ -102,7 +103,6 @@ async def update_application(
     # Update status
     application.status = update_data.status
     
-    db.commit()
-    db.refresh(application)
+    await db.commit()
     
     return application
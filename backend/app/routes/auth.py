@@ -1,21 +1,18 @@
 """
 Authentication routes for user signup, login, and token management.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from datetime import timedelta
+from fastapi import APIRouter, HTTPException, status
+from sqlalchemy import select
 
 from app.core.security import (
-    verify_password,
+    verify_and_update_password,
     get_password_hash,
     create_access_token,
     create_refresh_token,
     decode_token,
-    get_current_user,
     validate_password_strength
 )
-from app.core.config import settings
-from app.db.database import get_db
+from app.core.deps import CurrentUser, DBSession
 from app.models.user import User
 from app.schemas import UserCreate, UserLogin, Token, TokenRefresh, UserResponse
 
@@ -24,7 +21,7 @@ router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
 
 @router.post("/signup", response_model=Token, status_code=status.HTTP_201_CREATED)
-async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
+async def signup(user_data: UserCreate, db: DBSession):
     """
     Register a new user account.
     
@@ -33,7 +30,7 @@ async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
     - **full_name**: User's full name
     """
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == user_data.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -44,7 +41,7 @@ async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
     validate_password_strength(user_data.password)
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash(user_data.password)
     new_user = User(
         email=user_data.email,
         password_hash=hashed_password,
@@ -52,8 +49,7 @@ async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
     
     # Generate tokens
     access_token = create_access_token(data={"sub": str(new_user.id)})
@@ -67,14 +63,14 @@ async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=Token)
-async def login(credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(credentials: UserLogin, db: DBSession):
     """
     Login with email and password.
     
     Returns JWT access and refresh tokens.
     """
     # Find user by email
-    user = db.query(User).filter(User.email == credentials.email).first()
+    user = await db.scalar(select(User).where(User.email == credentials.email))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -82,12 +78,18 @@ async def login(credentials: UserLogin, db: Session = Depends(get_db)):
         )
     
     # Verify password
-    if not verify_password(credentials.password, user.password_hash):
+    verified, new_hash = await verify_and_update_password(credentials.password, user.password_hash)
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
         )
     
+    # Rehash legacy bcrypt passwords with the current scheme
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
+    
     # Generate tokens
     access_token = create_access_token(data={"sub": str(user.id)})
     refresh_token = create_refresh_token(data={"sub": str(user.id)})
@@ -100,7 +102,7 @@ async def login(credentials: UserLogin, db: Session = Depends(get_db)):
 
 
 @router.post("/refresh", response_model=Token)
-async def refresh_token(token_data: TokenRefresh, db: Session = Depends(get_db)):
+async def refresh_token(token_data: TokenRefresh, db: DBSession):
     """
     Refresh access token using refresh token.
     """
@@ -122,7 +124,7 @@ async def refresh_token(token_data: TokenRefresh, db: Session = Depends(get_db))
         )
     
     # Verify user exists
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -141,7 +143,7 @@ async def refresh_token(token_data: TokenRefresh, db: Session = Depends(get_db))
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(current_user: CurrentUser):
     """
     Get current authenticated user's profile.
     
@@ -1,44 +1,62 @@
 """
 Job routes for browsing jobs, getting matches, and managing saved jobs.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, status, Query
+from sqlalchemy import and_, exists, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from app.core.security import get_current_user
-from app.db.database import get_db
-from app.models.user import User
+from app.core.config import settings
+from app.core.deps import CurrentUser, DBSession
+from app.db.database import acquire_startup_lock
 from app.models.job import Job
 from app.models.resume import Resume, Preference
 from app.models.match import Match
 from app.models.application import SavedJob
 from app.schemas import JobResponse, JobWithMatch, SavedJobResponse
-from app.services.matcher import job_matcher
+from app.services.matcher import cosine_similarities, job_matcher
 from app.services.job_fetcher import get_mock_jobs
 
 
 router = APIRouter(prefix="/api/jobs", tags=["Jobs"])
 
 
-def seed_jobs_if_empty(db: Session) -> None:
-    """Seed database with mock jobs if empty."""
-    job_count = db.query(Job).count()
-    if job_count == 0:
-        mock_jobs = get_mock_jobs()
-        for job_data in mock_jobs:
-            job = Job(**job_data)
-            db.add(job)
-        db.commit()
+async def seed_jobs_if_empty(db: AsyncSession) -> None:
+    """
+    Seed database with mock jobs (and their embeddings) if empty, and embed
+    any stored job that has no embedding yet.
+    """
+    # Keep concurrently starting workers from seeding twice
+    await acquire_startup_lock(db)
+    has_jobs = await db.scalar(select(exists().select_from(Job)))
+    if not has_jobs:
+        jobs = [Job(**job_data) for job_data in get_mock_jobs()]
+        db.add_all(jobs)
+    else:
+        # Backfill jobs stored before embeddings existed, so matching never
+        # has to encode job descriptions on a request
+        jobs = (await db.scalars(select(Job).where(Job.embedding.is_(None)))).all()
+    
+    if jobs:
+        # Embed all descriptions in one batched pass
+        embeddings = job_matcher.encode_texts([job.description for job in jobs])
+        for job, embedding in zip(jobs, embeddings):
+            job.embedding = embedding
+        
+        await db.commit()
 
 
 @router.get("", response_model=List[JobResponse])
 async def get_jobs(
+    current_user: CurrentUser,
+    db: DBSession,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    location: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    location: Optional[str] = None
 ):
     """
     Get all job listings with pagination.
@@ -47,29 +65,26 @@ async def get_jobs(
     - **page_size**: Items per page (default: 20, max: 100)
     - **location**: Filter by location (optional)
     """
-    # Seed jobs if database is empty
-    seed_jobs_if_empty(db)
-    
     # Build query
-    query = db.query(Job)
+    query = select(Job)
     
     if location:
-        query = query.filter(Job.location.ilike(f"%{location}%"))
+        query = query.where(Job.location.ilike(f"%{location}%"))
     
     # Apply pagination
     offset = (page - 1) * page_size
-    jobs = query.order_by(Job.posted_at.desc()).offset(offset).limit(page_size).all()
+    jobs = await db.scalars(query.order_by(Job.posted_at.desc()).offset(offset).limit(page_size))
     
-    return jobs
+    return jobs.all()
 
 
 @router.get("/matched", response_model=List[JobWithMatch])
 async def get_matched_jobs(
+    current_user: CurrentUser,
+    db: DBSession,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    min_score: float = Query(0, ge=0, le=100),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    min_score: float = Query(0, ge=0, le=100)
 ):
     """
     Get job listings with AI-calculated match scores.
@@ -80,13 +95,13 @@ async def get_matched_jobs(
     - **page_size**: Items per page (default: 20, max: 100)
     - **min_score**: Minimum match score filter (default: 0)
     """
-    # Seed jobs if database is empty
-    seed_jobs_if_empty(db)
-    
-    # Get user's most recent resume
-    resume = db.query(Resume).filter(
-        Resume.user_id == current_user.id
-    ).order_by(Resume.uploaded_at.desc()).first()
+    # Get user's most recent parsed resume
+    resume = await db.scalar(
+        select(Resume).where(
+            Resume.user_id == current_user.id,
+            Resume.parse_status == "parsed"
+        ).order_by(Resume.uploaded_at.desc()).limit(1)
+    )
     
     if not resume:
         raise HTTPException(
@@ -95,94 +110,142 @@ async def get_matched_jobs(
         )
     
     # Get user preferences
-    preferences = db.query(Preference).filter(
-        Preference.user_id == current_user.id
-    ).first()
+    preferences = await db.scalar(
+        select(Preference).where(Preference.user_id == current_user.id)
+    )
     
-    # Get all jobs
-    all_jobs = db.query(Job).all()
+    # A stored match is reused for 24 hours before it is recalculated
+    fresh_match = and_(
+        Match.job_id == Job.id,
+        Match.user_id == current_user.id,
+        Match.calculated_at > datetime.utcnow() - timedelta(hours=24)
+    )
+    
+    # Score only the jobs that have no fresh match for this user yet
+    unscored_jobs = select(Job).outerjoin(Match, fresh_match).where(Match.id.is_(None))
     
-    # Calculate match scores for each job
-    matched_jobs = []
-    for job in all_jobs:
-        # Check if match already exists and is recent (within 24 hours)
-        existing_match = db.query(Match).filter(
-            Match.user_id == current_user.id,
-            Match.job_id == job.id
-        ).order_by(Match.calculated_at.desc()).first()
+    # The semantic layer comes from pgvector: encode the resume once and
+    # compare it against the stored job embeddings in SQL
+    semantic_scores = {}
+    resume_summary = resume.parsed_data.get("summary")
+    if resume_summary:
+        resume_embedding = job_matcher.encode_texts([resume_summary])[0]
+        distance = Job.embedding.cosine_distance(resume_embedding)
+        unscored_jobs = unscored_jobs.add_columns(1 - distance)
+        if settings.MATCH_CANDIDATES:
+            # Only the jobs nearest to the resume get the full scoring; the
+            # HNSW index on Job.embedding serves this search, and returns at
+            # most hnsw.ef_search rows, so widen it for this transaction
+            await db.execute(select(func.set_config(
+                "hnsw.ef_search", str(max(settings.MATCH_CANDIDATES, 40)), True
+            )))
+            nearest_jobs = select(Job.id).order_by(distance).limit(settings.MATCH_CANDIDATES)
+            unscored_jobs = unscored_jobs.where(Job.id.in_(nearest_jobs))
         
-        if existing_match and (datetime.utcnow() - existing_match.calculated_at).total_seconds() < 86400:
-            # Use existing match
-            match_result = {
-                "match_score": existing_match.match_score,
-                "score_breakdown": existing_match.score_breakdown
-            }
-        else:
-            # Calculate new match score
-            match_result = job_matcher.calculate_match_score(
-                resume_data=resume.parsed_data,
-                job_data={
+        rows = (await db.execute(unscored_jobs)).all()
+        jobs_to_score = [job for job, _ in rows]
+        semantic_scores = {job.id: similarity for job, similarity in rows if similarity is not None}
+    else:
+        jobs_to_score = (await db.scalars(unscored_jobs)).all()
+    
+    if jobs_to_score:
+        if resume_summary:
+            # Embed jobs stored without an embedding in one batch and keep
+            # the vectors so later requests take the SQL path
+            unembedded_jobs = [job for job in jobs_to_score if job.id not in semantic_scores]
+            if unembedded_jobs:
+                embeddings = job_matcher.encode_texts(
+                    [job.description for job in unembedded_jobs],
+                    batch_size=32
+                )
+                for job, embedding, score in zip(unembedded_jobs, embeddings, cosine_similarities(embeddings, resume_embedding)):
+                    job.embedding = embedding
+                    semantic_scores[job.id] = float(score)
+        
+        # Score every job against the resume in one pass
+        match_results = job_matcher.score_bulk(
+            resume_data=resume.parsed_data,
+            job_list=[
+                {
                     "required_skills": job.required_skills or [],
                     "description": job.description,
                     "experience_required": job.experience_required,
                     "location": job.location,
                     "salary_min": job.salary_min,
                     "salary_max": job.salary_max
-                },
-                preferences=preferences.__dict__ if preferences else None
-            )
-            
-            # Save match to database
-            match = Match(
-                user_id=current_user.id,
-                job_id=job.id,
-                match_score=match_result["match_score"],
-                score_breakdown=match_result["score_breakdown"]
-            )
-            db.add(match)
+                }
+                for job in jobs_to_score
+            ],
+            preferences=preferences.__dict__ if preferences else None,
+            semantic_scores=[semantic_scores.get(job.id) for job in jobs_to_score]
+        )
         
-        # Filter by minimum score
-        if match_result["match_score"] >= min_score:
-            job_dict = {
-                "id": job.id,
-                "title": job.title,
-                "company": job.company,
-                "description": job.description,
-                "location": job.location,
-                "salary_min": job.salary_min,
-                "salary_max": job.salary_max,
-                "experience_required": job.experience_required,
-                "required_skills": job.required_skills,
-                "source": job.source,
-                "external_url": job.external_url,
-                "posted_at": job.posted_at,
+        calculated_at = datetime.utcnow()
+        new_matches = [
+            {
+                "user_id": current_user.id,
+                "job_id": job.id,
                 "match_score": match_result["match_score"],
-                "score_breakdown": match_result["score_breakdown"]
+                "score_breakdown": match_result["score_breakdown"],
+                "calculated_at": calculated_at
             }
-            matched_jobs.append(job_dict)
-    
-    db.commit()
-    
-    # Sort by match score (descending)
-    matched_jobs.sort(key=lambda x: x["match_score"], reverse=True)
+            for job, match_result in zip(jobs_to_score, match_results)
+        ]
+        
+        # Upsert all scores, replacing stale matches; executemany form lets
+        # SQLAlchemy batch the rows into multi-row INSERTs that stay under
+        # asyncpg's bind parameter limit
+        stmt = pg_insert(Match)
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_matches_user_job",
+            set_={
+                "match_score": stmt.excluded.match_score,
+                "score_breakdown": stmt.excluded.score_breakdown,
+                "calculated_at": stmt.excluded.calculated_at
+            }
+        )
+        await db.execute(stmt, new_matches)
+        await db.commit()
     
-    # Apply pagination
+    # Filter, rank and paginate the stored matches in SQL
     offset = (page - 1) * page_size
-    paginated_jobs = matched_jobs[offset:offset + page_size]
+    rows = await db.execute(
+        select(Job, Match).join(Match, fresh_match).where(
+            Match.match_score >= min_score
+        ).order_by(Match.match_score.desc(), Job.id).offset(offset).limit(page_size)
+    )
     
-    return paginated_jobs
+    return [
+        {
+            "id": job.id,
+            "title": job.title,
+            "company": job.company,
+            "description": job.description,
+            "location": job.location,
+            "salary_min": job.salary_min,
+            "salary_max": job.salary_max,
+            "experience_required": job.experience_required,
+            "required_skills": job.required_skills,
+            "source": job.source,
+            "external_url": job.external_url,
+            "posted_at": job.posted_at,
+            "match_score": match.match_score,
+            "score_breakdown": match.score_breakdown
+        }
+        for job, match in rows
+    ]
 
 
 @router.get("/{job_id}", response_model=JobResponse)
 async def get_job(
     job_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser,
+    db: DBSession
 ):
     """
     Get detailed information about a specific job.
     """
-    job = db.query(Job).filter(Job.id == job_id).first()
+    job = await db.get(Job, job_id)
     
     if not job:
         raise HTTPException(
@@ -196,41 +259,38 @@ async def get_job(
 @router.post("/{job_id}/save", response_model=SavedJobResponse, status_code=status.HTTP_201_CREATED)
 async def save_job(
     job_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser,
+    db: DBSession
 ):
     """
     Save a job to your saved jobs list.
     """
-    # Check if job exists
-    job = db.query(Job).filter(Job.id == job_id).first()
-    if not job:
+    # Insert in one round trip; the unique (user_id, job_id) constraint
+    # rejects duplicates and the job foreign key rejects unknown jobs
+    stmt = pg_insert(SavedJob).values(
+        user_id=current_user.id,
+        job_id=job_id
+    ).on_conflict_do_nothing(constraint="uq_saved_jobs_user_job").returning(SavedJob)
+    
+    try:
+        saved_job = await db.scalar(stmt)
+    except IntegrityError:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Job not found"
         )
     
-    # Check if already saved
-    existing_saved = db.query(SavedJob).filter(
-        SavedJob.user_id == current_user.id,
-        SavedJob.job_id == job_id
-    ).first()
-    
-    if existing_saved:
+    if saved_job is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Job already saved"
         )
     
-    # Save job
-    saved_job = SavedJob(
-        user_id=current_user.id,
-        job_id=job_id
-    )
+    await db.commit()
     
-    db.add(saved_job)
-    db.commit()
-    db.refresh(saved_job)
+    # The response embeds the job, which can't be lazy-loaded in async
+    await db.refresh(saved_job, ["job"])
     
     return saved_job
 
@@ -238,16 +298,18 @@ async def save_job(
 @router.delete("/{job_id}/save", status_code=status.HTTP_204_NO_CONTENT)
 async def unsave_job(
     job_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser,
+    db: DBSession
 ):
     """
     Remove a job from your saved jobs list.
     """
-    saved_job = db.query(SavedJob).filter(
-        SavedJob.user_id == current_user.id,
-        SavedJob.job_id == job_id
-    ).first()
+    saved_job = await db.scalar(
+        select(SavedJob).where(
+            SavedJob.user_id == current_user.id,
+            SavedJob.job_id == job_id
+        )
+    )
     
     if not saved_job:
         raise HTTPException(
@@ -255,22 +317,24 @@ async def unsave_job(
             detail="Saved job not found"
         )
     
-    db.delete(saved_job)
-    db.commit()
+    await db.delete(saved_job)
+    await db.commit()
     
     return None
 
 
 @router.get("/saved/list", response_model=List[SavedJobResponse])
 async def get_saved_jobs(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser,
+    db: DBSession
 ):
     """
     Get all saved jobs for the current user.
     """
-    saved_jobs = db.query(SavedJob).filter(
-        SavedJob.user_id == current_user.id
-    ).order_by(SavedJob.saved_at.desc()).all()
+    saved_jobs = await db.scalars(
+        select(SavedJob).options(selectinload(SavedJob.job)).where(
+            SavedJob.user_id == current_user.id
+        ).order_by(SavedJob.saved_at.desc())
+    )
     
-    return saved_jobs
+    return saved_jobs.all()
@@ -1,12 +1,12 @@
 """
 Job preference routes for managing user job preferences.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, status
+from datetime import datetime
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
-from app.core.security import get_current_user
-from app.db.database import get_db
-from app.models.user import User
+from app.core.deps import CurrentUser, DBSession
 from app.models.resume import Preference
 from app.schemas import PreferenceCreate, PreferenceResponse
 
@@ -17,51 +17,44 @@ router = APIRouter(prefix="/api/preferences", tags=["Preferences"])
 @router.post("", response_model=PreferenceResponse, status_code=status.HTTP_201_CREATED)
 async def create_preferences(
     pref_data: PreferenceCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser,
+    db: DBSession
 ):
     """
     Set job preferences for the current user.
     
     If preferences already exist, they will be updated.
     """
-    # Check if preferences already exist
-    existing_pref = db.query(Preference).filter(
-        Preference.user_id == current_user.id
-    ).first()
+    # Insert or update in one atomic statement against the unique user_id;
+    # only the fields sent in this request are written (new rows leave the
+    # rest NULL)
+    values = pref_data.model_dump(exclude_unset=True)
+    stmt = pg_insert(Preference).values(user_id=current_user.id, **values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Preference.user_id],
+        set_={
+            **{key: stmt.excluded[key] for key in values},
+            "updated_at": datetime.utcnow()
+        }
+    ).returning(Preference)
     
-    if existing_pref:
-        # Update existing preferences
-        for key, value in pref_data.model_dump(exclude_unset=True).items():
-            setattr(existing_pref, key, value)
-        db.commit()
-        db.refresh(existing_pref)
-        return existing_pref
-    
-    # Create new preferences
-    preference = Preference(
-        user_id=current_user.id,
-        **pref_data.model_dump()
-    )
-    
-    db.add(preference)
-    db.commit()
-    db.refresh(preference)
+    preference = await db.scalar(stmt)
+    await db.commit()
     
     return preference
 
 
 @router.get("", response_model=PreferenceResponse)
 async def get_preferences(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser,
+    db: DBSession
 ):
     """
     Get current user's job preferences.
     """
-    preference = db.query(Preference).filter(
-        Preference.user_id == current_user.id
-    ).first()
+    preference = await db.scalar(
+        select(Preference).where(Preference.user_id == current_user.id)
+    )
     
     if not preference:
         raise HTTPException(
@@ -75,15 +68,18 @@ async def get_preferences(
 @router.put("", response_model=PreferenceResponse)
 async def update_preferences(
     pref_data: PreferenceCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser,
+    db: DBSession
 ):
     """
     Update job preferences.
     """
-    preference = db.query(Preference).filter(
-        Preference.user_id == current_user.id
-    ).first()
+    # Update the sent fields and read the row back in one statement
+    preference = await db.scalar(
+        update(Preference).where(
+            Preference.user_id == current_user.id
+        ).values(**pref_data.model_dump(exclude_unset=True)).returning(Preference)
+    )
     
     if not preference:
         raise HTTPException(
@@ -91,11 +87,6 @@ async def update_preferences(
             detail="Preferences not found. Please create preferences first."
         )
     
-    # Update fields
-    for key, value in pref_data.model_dump(exclude_unset=True).items():
-        setattr(preference, key, value)
-    
-    db.commit()
-    db.refresh(preference)
+    await db.commit()
     
     return preference
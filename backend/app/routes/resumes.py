@@ -1,144 +1,395 @@
 """
 Resume routes for uploading and managing resumes.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, BackgroundTasks, HTTPException, status, UploadFile, File, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, delete, exists, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import defer
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.datastructures import State
+from typing import Any, Dict, List, Optional
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import suppress
+import asyncio
+from datetime import datetime, timedelta
+import hashlib
+import logging
 import os
+import aiofiles
+import aiofiles.os
 import uuid
-from pathlib import Path
 
-from app.core.security import get_current_user
 from app.core.config import settings
-from app.db.database import get_db
-from app.models.user import User
+from app.core.deps import CurrentUser, DBSession
+from app.db.database import SessionLocal, acquire_file_lock, acquire_startup_lock
 from app.models.resume import Resume, ResumeSkill
-from app.schemas import ResumeUpload, ResumeResponse
-from app.services.resume_parser import resume_parser
+from app.schemas import ResumeResponse
+from app.services.resume_parser import create_parser_pool, parse_resume_file
 
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/resumes", tags=["Resumes"])
 
+# Uploads are copied to disk in chunks of this many bytes
+UPLOAD_CHUNK_SIZE = 1 << 20
 
-def validate_file(file: UploadFile) -> None:
-    """Validate uploaded file."""
-    # Check file extension
-    file_ext = Path(file.filename).suffix.lower()
-    if file_ext not in settings.ALLOWED_EXTENSIONS:
+# Allowance for the multipart boundaries and part headers around the file
+# when comparing Content-Length against MAX_FILE_SIZE
+MULTIPART_OVERHEAD = 16 * 1024
+
+# Set once the upload directory is known to exist
+_upload_dir_ready = False
+
+
+async def ensure_upload_dir() -> str:
+    """Create the upload directory once per process and return its path."""
+    global _upload_dir_ready
+    upload_dir = os.path.normpath(settings.UPLOAD_DIR)
+    if not _upload_dir_ready:
+        await aiofiles.os.makedirs(upload_dir, exist_ok=True)
+        _upload_dir_ready = True
+    return upload_dir
+
+
+def validate_file(file: UploadFile, request: Request) -> str:
+    """Validate uploaded file and return its lowercased extension."""
+    # Reject bodies that are plainly too large before copying anything
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > settings.MAX_FILE_SIZE + MULTIPART_OVERHEAD:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File type {file_ext} not allowed. Allowed types: {settings.ALLOWED_EXTENSIONS}"
+            detail=f"File too large. Maximum size: {settings.MAX_FILE_SIZE / 1024 / 1024}MB"
         )
     
-    # Check file size (read first chunk to estimate)
-    file.file.seek(0, 2)  # Seek to end
-    file_size = file.file.tell()
-    file.file.seek(0)  # Reset to beginning
-    
-    if file_size > settings.MAX_FILE_SIZE:
+    # Check file extension
+    file_ext = os.path.splitext(file.filename)[1].lower()
+    if file_ext not in settings.ALLOWED_EXTENSIONS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File too large. Maximum size: {settings.MAX_FILE_SIZE / 1024 / 1024}MB"
+            detail=f"File type {file_ext} not allowed. Allowed types: {', '.join(sorted(settings.ALLOWED_EXTENSIONS))}"
         )
+    
+    return file_ext
+
+
+async def touch_resume(
+    resume: Resume,
+    filename: str,
+    request: Request,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession
+) -> Resume:
+    """
+    Mark an already stored resume as the latest upload.
+    
+    A resume whose parse failed or was lost is queued for parsing again
+    (202); a parsed one is returned as is (200).
+    """
+    resume.uploaded_at = datetime.utcnow()
+    needs_parse = resume.parse_status != "parsed"
+    if needs_parse:
+        resume.parse_status = "pending"
+    await db.commit()
+    
+    if not needs_parse:
+        response.status_code = status.HTTP_200_OK
+        return resume
+    
+    background_tasks.add_task(
+        parse_resume_in_background,
+        resume.id,
+        resume.file_url,
+        filename,
+        request.app.state
+    )
+    
+    response.status_code = status.HTTP_202_ACCEPTED
+    return resume
+
+
+async def save_parsed_data(resume: Resume, parsed_data: Dict[str, Any], db: AsyncSession) -> None:
+    """Store parsed resume data and its skills on a resume (not committed)."""
+    resume.raw_text = parsed_data.get("raw_text")
+    resume.parsed_data = parsed_data
+    resume.parse_status = "parsed"
+    await db.flush()
+    
+    # Save extracted skills with one executemany, in the same transaction
+    skill_rows = [
+        {
+            "resume_id": resume.id,
+            "skill_name": skill_data.get("skill_name"),
+            "skill_category": skill_data.get("skill_category")
+        }
+        for skill_data in parsed_data.get("skills", [])
+    ]
+    if skill_rows:
+        await db.execute(insert(ResumeSkill), skill_rows)
+
+
+async def run_parser(app_state: State, file_path: str, filename: str) -> Dict[str, Any]:
+    """
+    Parse a stored resume on the app's parser pool.
+    
+    A pool whose worker died (e.g. killed for using too much memory) is
+    broken for good, so it is replaced and the parse retried once.
+    
+    Args:
+        app_state: Application state holding parser_pool; parses in the
+            threadpool when the pool is not set
+        file_path: Path of the stored resume file
+        filename: Original filename
+        
+    Returns:
+        Parsed resume data
+    """
+    parser_pool = app_state.parser_pool
+    if parser_pool is None:
+        return await run_in_threadpool(parse_resume_file, file_path, filename)
+    
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(parser_pool, parse_resume_file, file_path, filename)
+    except BrokenProcessPool:
+        # Parses that failed on the same pool only replace it once
+        if app_state.parser_pool is parser_pool:
+            logger.warning("Resume parser pool broke; starting a new one")
+            app_state.parser_pool = create_parser_pool()
+            parser_pool.shutdown(wait=False)
+        return await loop.run_in_executor(app_state.parser_pool, parse_resume_file, file_path, filename)
 
 
-@router.post("/upload", response_model=ResumeResponse, status_code=status.HTTP_201_CREATED)
+async def parse_resume_in_background(
+    resume_id: uuid.UUID,
+    file_path: str,
+    filename: str,
+    app_state: State,
+    parsed_data: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Parse a stored resume after the upload response has been sent.
+    
+    Args:
+        resume_id: ID of the pending resume
+        file_path: Path of the stored resume file
+        filename: Original filename
+        app_state: Application state holding the parser pool
+        parsed_data: Parsed data of an identical file to store instead of
+            parsing (optional)
+    """
+    if parsed_data is None:
+        try:
+            parsed_data = await run_parser(app_state, file_path, filename)
+        except Exception:
+            logger.exception("Failed to parse resume %s", resume_id)
+    
+    async with SessionLocal() as db:
+        resume = await db.get(Resume, resume_id, with_for_update=True)
+        if resume is None or resume.parse_status != "pending":
+            # Deleted while it was being parsed, or a requeued parse of the
+            # same resume finished first
+            return
+        
+        if parsed_data is None:
+            resume.parse_status = "failed"
+        else:
+            await save_parsed_data(resume, parsed_data, db)
+        await db.commit()
+
+
+async def requeue_stale_resumes(app_state: State) -> None:
+    """
+    Parse again the resumes whose background parse was lost.
+    
+    Background parses don't survive a worker restart, so resumes left
+    pending for longer than RESUME_PARSE_TIMEOUT are parsed again; newer
+    ones may still be parsing on another worker. Every worker runs this at
+    startup, and each stale resume is claimed by exactly one of them.
+    
+    Args:
+        app_state: Application state holding the parser pool
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.RESUME_PARSE_TIMEOUT)
+    async with SessionLocal() as db:
+        # Claim the stale resumes by restarting their clock, and commit the
+        # claim before parsing, so workers starting later skip them
+        await acquire_startup_lock(db)
+        stale_resumes = (await db.execute(
+            update(Resume).where(
+                Resume.parse_status == "pending",
+                Resume.uploaded_at < cutoff
+            ).values(uploaded_at=datetime.utcnow()).returning(Resume.id, Resume.file_url)
+        )).all()
+        await db.commit()
+    
+    for resume_id, file_path in stale_resumes:
+        logger.warning("Requeueing lost parse of resume %s", resume_id)
+        await parse_resume_in_background(resume_id, file_path, os.path.basename(file_path), app_state)
+
+
+@router.post("/upload", response_model=ResumeResponse, status_code=status.HTTP_202_ACCEPTED)
 async def upload_resume(
-    file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    current_user: CurrentUser,
+    db: DBSession,
+    file: UploadFile = File(...)
 ):
     """
-    Upload and parse a resume (PDF only for MVP).
+    Upload a resume (PDF only for MVP) and queue it for parsing.
     
     The resume will be automatically parsed to extract:
     - Skills
     - Work experience
     - Education
     - Contact information
-    """
-    # Validate file
-    validate_file(file)
-    
-    # Read file content
-    file_content = await file.read()
     
-    # Create upload directory if it doesn't exist
-    upload_dir = Path(settings.UPLOAD_DIR)
-    upload_dir.mkdir(parents=True, exist_ok=True)
+    Returns 202 with parse_status "pending"; poll GET /api/resumes/{id}
+    until it becomes "parsed" (or "failed").
     
-    # Generate unique filename
-    file_ext = Path(file.filename).suffix
-    unique_filename = f"{uuid.uuid4()}{file_ext}"
-    file_path = upload_dir / unique_filename
+    Files are stored by content hash: re-uploading a parsed resume returns
+    the existing record (200), one whose parse failed is parsed again, and
+    a file another user already uploaded reuses that parse in the
+    background (still 202, so uploads don't reveal other users' files).
+    """
+    # Validate file
+    file_ext = validate_file(file, request)
     
-    # Save file
-    with open(file_path, "wb") as f:
-        f.write(file_content)
+    upload_dir = await ensure_upload_dir()
     
-    # Parse resume
+    # Stream the upload to a temporary file, hashing and enforcing the
+    # size limit as bytes arrive
+    temp_path = os.path.join(upload_dir, "." + uuid.uuid4().hex + file_ext + ".part")
     try:
-        parsed_data = resume_parser.parse(file_content, file.filename)
-    except Exception as e:
-        # Clean up file if parsing fails
-        if file_path.exists():
-            os.remove(file_path)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to parse resume: {str(e)}"
+        hasher = hashlib.sha256()
+        file_size = 0
+        async with aiofiles.open(temp_path, "wb") as f:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                file_size += len(chunk)
+                if file_size > settings.MAX_FILE_SIZE:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"File too large. Maximum size: {settings.MAX_FILE_SIZE / 1024 / 1024}MB"
+                    )
+                hasher.update(chunk)
+                await f.write(chunk)
+        
+        digest = hasher.hexdigest()
+        
+        # Look for the same file, preferring the current user's own copy
+        known_resume = await db.scalar(
+            select(Resume).where(Resume.content_sha256 == digest).order_by(
+                (Resume.user_id == current_user.id).desc()
+            ).limit(1)
         )
-    
-    # Create resume record
-    resume = Resume(
-        user_id=current_user.id,
-        file_url=str(file_path),
-        raw_text=parsed_data.get("raw_text"),
-        parsed_data=parsed_data
-    )
-    
-    db.add(resume)
-    db.commit()
-    db.refresh(resume)
-    
-    # Save extracted skills
-    for skill_data in parsed_data.get("skills", []):
-        skill = ResumeSkill(
-            resume_id=resume.id,
-            skill_name=skill_data.get("skill_name"),
-            skill_category=skill_data.get("skill_category")
+        
+        if known_resume is not None and known_resume.user_id == current_user.id:
+            # Re-upload: make the existing resume the latest one again
+            return await touch_resume(known_resume, file.filename, request, response, background_tasks, db)
+        
+        # Create resume record; files are stored under their digest, so
+        # identical uploads share one copy. Hold the file's lock until
+        # commit, so a delete of another copy can't remove it meanwhile.
+        file_path = os.path.join(upload_dir, digest + file_ext)
+        await acquire_file_lock(db, file_path)
+        resume = Resume(
+            user_id=current_user.id,
+            file_url=file_path,
+            content_sha256=digest
         )
-        db.add(skill)
+        
+        db.add(resume)
+        try:
+            await db.flush()
+        except IntegrityError as e:
+            # A concurrent request stored the same file for this user first
+            await db.rollback()
+            existing_resume = await db.scalar(
+                select(Resume).where(
+                    Resume.user_id == current_user.id,
+                    Resume.content_sha256 == digest
+                )
+            )
+            if existing_resume is None:
+                # Another constraint failed, or that resume was deleted since
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="The upload conflicted with another change. Please try again."
+                ) from e
+            return await touch_resume(existing_resume, file.filename, request, response, background_tasks, db)
+        
+        # Another user's copy of this file may already have been parsed
+        known_parsed_data = None
+        if known_resume is not None and known_resume.parse_status == "parsed":
+            known_parsed_data = known_resume.parsed_data
+        
+        # Move the file into place last, then commit everything at once
+        try:
+            if not await aiofiles.os.path.exists(file_path):
+                await aiofiles.os.replace(temp_path, file_path)
+        except OSError:
+            await db.rollback()
+            logger.exception("Failed to store resume file %s", file_path)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Could not store the uploaded file"
+            )
+        
+        await db.commit()
+    finally:
+        # Drop the temporary file unless it was moved into place
+        with suppress(FileNotFoundError):
+            await aiofiles.os.remove(temp_path)
     
-    db.commit()
+    # Parse (or store the reused parse) after the response is sent, so the
+    # response is the same either way
+    background_tasks.add_task(
+        parse_resume_in_background,
+        resume.id,
+        file_path,
+        file.filename,
+        request.app.state,
+        known_parsed_data
+    )
     
     return resume
 
 
 @router.get("", response_model=List[ResumeResponse])
 async def get_resumes(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser,
+    db: DBSession
 ):
     """
     Get all resumes for the current user.
     """
-    resumes = db.query(Resume).filter(Resume.user_id == current_user.id).all()
-    return resumes
+    # raw_text isn't part of the response, so leave it in the database
+    resumes = await db.scalars(
+        select(Resume).options(defer(Resume.raw_text)).where(Resume.user_id == current_user.id)
+    )
+    
+    return resumes.all()
 
 
 @router.get("/{resume_id}", response_model=ResumeResponse)
 async def get_resume(
     resume_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser,
+    db: DBSession
 ):
     """
     Get a specific resume by ID.
     """
-    resume = db.query(Resume).filter(
-        Resume.id == resume_id,
-        Resume.user_id == current_user.id
-    ).first()
+    resume = await db.scalar(
+        select(Resume).options(defer(Resume.raw_text)).where(
+            Resume.id == resume_id,
+            Resume.user_id == current_user.id
+        )
+    )
     
     if not resume:
         raise HTTPException(
@@ -152,29 +403,39 @@ async def get_resume(
 @router.delete("/{resume_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_resume(
     resume_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser,
+    db: DBSession
 ):
     """
     Delete a resume.
     """
-    resume = db.query(Resume).filter(
-        Resume.id == resume_id,
-        Resume.user_id == current_user.id
-    ).first()
+    owned_resume = and_(Resume.id == resume_id, Resume.user_id == current_user.id)
     
-    if not resume:
+    # Delete the skills and the resume without loading either; RETURNING
+    # hands back the file to clean up
+    await db.execute(
+        delete(ResumeSkill).where(
+            ResumeSkill.resume_id == select(Resume.id).where(owned_resume).scalar_subquery()
+        )
+    )
+    file_url = await db.scalar(delete(Resume).where(owned_resume).returning(Resume.file_url))
+    
+    if file_url is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Resume not found"
         )
     
-    # Delete file from storage
-    if os.path.exists(resume.file_url):
-        os.remove(resume.file_url)
+    # Delete file from storage unless another resume shares it, under the
+    # lock uploads of the same file take, so none can start sharing it
+    # before the delete commits
+    await acquire_file_lock(db, file_url)
+    file_shared = await db.scalar(
+        select(exists().where(Resume.file_url == file_url))
+    )
+    if not file_shared and await aiofiles.os.path.exists(file_url):
+        await aiofiles.os.remove(file_url)
     
-    # Delete from database
-    db.delete(resume)
-    db.commit()
+    await db.commit()
     
     return None
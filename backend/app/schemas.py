@@ -1,7 +1,7 @@
 """
 Pydantic schemas for request/response validation.
 """
-from pydantic import BaseModel, EmailStr, Field, validator
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from uuid import UUID
@@ -41,8 +41,7 @@ class UserResponse(BaseModel):
     full_name: str
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ============= Resume Schemas =============
@@ -58,6 +57,7 @@ class ParsedResumeData(BaseModel):
     """Schema for parsed resume data."""
     skills: List[str]
     experience: List[Dict[str, Any]]
+    total_experience_years: Optional[float] = None
     education: List[Dict[str, Any]]
     summary: Optional[str] = None
 
@@ -67,11 +67,11 @@ class ResumeResponse(BaseModel):
     id: UUID
     user_id: UUID
     file_url: str
+    parse_status: str
     parsed_data: Optional[Dict[str, Any]]
     uploaded_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ============= Preference Schemas =============
@@ -98,8 +98,7 @@ class PreferenceResponse(BaseModel):
     max_salary: Optional[int]
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ============= Job Schemas =============
@@ -119,8 +118,7 @@ class JobResponse(BaseModel):
     external_url: Optional[str]
     posted_at: Optional[datetime]
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class JobWithMatch(JobResponse):
@@ -140,8 +138,7 @@ class MatchResponse(BaseModel):
     score_breakdown: Optional[Dict[str, float]]
     calculated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ============= Application Schemas =============
@@ -166,8 +163,7 @@ class ApplicationResponse(BaseModel):
     updated_at: datetime
     job: Optional[JobResponse] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ============= Saved Job Schemas =============
@@ -185,8 +181,7 @@ class SavedJobResponse(BaseModel):
     saved_at: datetime
     job: Optional[JobResponse] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ============= Pagination Schemas =============
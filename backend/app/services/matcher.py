@@ -1,15 +1,148 @@
 """
-Job matching service using TF-IDF and Sentence Transformers.
+Job matching service using skill-set overlap and Sentence Transformers.
 Implements 3-layer matching algorithm for calculating job-resume compatibility.
 """
+import hashlib
+import logging
+import re
+import time
 import numpy as np
-from typing import Dict, List, Any, Optional
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from cachetools import LRUCache
+from typing import Dict, FrozenSet, Iterable, List, Any, Optional, Tuple, Union
 from sentence_transformers import SentenceTransformer
 
 from app.core.config import settings
 
+# Optional SIMD kernels for batched similarity; NumPy is used without them
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+
+# Score components, in the row order of JobMatcher.score_matrix(), and
+# their weights in the final score
+SCORE_COMPONENTS = (
+    "skill_match",
+    "semantic_similarity",
+    "experience_match",
+    "location_match",
+    "salary_match"
+)
+SCORE_WEIGHTS = np.array([0.5, 0.2, 0.1, 0.1, 0.1])
+
+logger = logging.getLogger(__name__)
+
+# Encoder failures are logged at most once per this many seconds per worker
+ENCODER_ERROR_LOG_INTERVAL = 60.0
+
+# Year ranges in experience requirements, e.g. "2-5 years"
+_EXPERIENCE_RANGE_RE = re.compile(r'(\d+)[-–](\d+)')
+
+
+def quantize_embeddings(embeddings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Quantize embeddings to int8 with a symmetric per-vector scale.
+    
+    Args:
+        embeddings: float array of shape (N, D)
+        
+    Returns:
+        Tuple of (int8 array of shape (N, D), float32 scales of shape (N,));
+        embeddings are recovered as quantized / scales[:, None]
+    """
+    peaks = np.abs(embeddings).max(axis=1)
+    scales = np.divide(127.0, peaks, out=np.ones_like(peaks), where=peaks > 0).astype(np.float32)
+    quantized = np.rint(embeddings * scales[:, np.newaxis]).astype(np.int8)
+    return quantized, scales
+
+
+def cosine_similarities(embeddings: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """
+    Cosine similarity of each row of embeddings with query.
+    
+    float32 inputs must be L2-normalized (as encode_texts returns them), so
+    the cosine is a dot product. int8 inputs (from encode_quantized) are
+    compared with a full cosine, which ignores their per-vector scales.
+    Computed with SimSIMD when it is installed.
+    
+    Args:
+        embeddings: float32 or int8 array of shape (N, D)
+        query: Array of shape (D,) with the same dtype
+        
+    Returns:
+        Array of shape (N,)
+    """
+    quantized = embeddings.dtype == np.int8
+    if simsimd is not None and len(embeddings):
+        if quantized:
+            distances = simsimd.cdist(embeddings, query[np.newaxis, :], metric="cosine")
+            return 1 - np.asarray(distances)[:, 0]
+        return np.asarray(simsimd.cdist(embeddings, query[np.newaxis, :], metric="dot"))[:, 0]
+    
+    if quantized:
+        embeddings = embeddings.astype(np.float32)
+        query = query.astype(np.float32)
+        norms = np.linalg.norm(embeddings, axis=1) * np.linalg.norm(query)
+        return np.divide(embeddings @ query, norms, out=np.zeros(len(embeddings), dtype=np.float32), where=norms > 0)
+    return embeddings @ query
+
+
+def salary_match_scores(
+    user_min_salary: Optional[int],
+    user_max_salary: Optional[int],
+    job_min_salaries: np.ndarray,
+    job_max_salaries: np.ndarray
+) -> np.ndarray:
+    """
+    Score salary compatibility for many jobs at once.
+    
+    Same results as JobMatcher.calculate_salary_match for each job, as
+    branchless array operations instead of a Python loop.
+    
+    Args:
+        user_min_salary: User's minimum salary expectation
+        user_max_salary: User's maximum salary expectation
+        job_min_salaries: Each job's minimum salary (0 where unset)
+        job_max_salaries: Each job's maximum salary (0 where unset)
+        
+    Returns:
+        Salary match scores (0-1), one per job
+    """
+    if not user_min_salary:
+        return np.full(len(job_max_salaries), 0.5)  # Neutral if no salary specified
+    
+    # Overlapping ranges match fully
+    user_max = user_max_salary or np.inf
+    overlap = (
+        (user_min_salary <= job_max_salaries) &
+        (user_max >= job_min_salaries) &
+        (np.minimum(user_max, job_max_salaries) >= np.maximum(user_min_salary, job_min_salaries))
+    )
+    
+    # User expectations too high: penalize by the relative gap
+    penalty = np.minimum((user_min_salary - job_max_salaries) / user_min_salary, 0.5)
+    too_high = np.maximum(0.0, 0.5 - penalty)
+    
+    scores = np.where(overlap, 1.0, np.where(user_min_salary > job_max_salaries, too_high, 0.3))
+    return np.where(job_max_salaries != 0, scores, 0.5)
+
+
+def popcount_rows(bits: np.ndarray) -> np.ndarray:
+    """
+    Count the set bits in each row of a uint64 bitset matrix.
+    
+    Args:
+        bits: uint64 array of shape (N, W)
+        
+    Returns:
+        int array of shape (N,)
+    """
+    if hasattr(np, "bitwise_count"):
+        # NumPy 2.0+ has a native popcount
+        return np.bitwise_count(bits).sum(axis=1, dtype=np.intp)
+    return np.unpackbits(np.ascontiguousarray(bits).view(np.uint8), axis=1).sum(axis=1, dtype=np.intp)
+
 
 class JobMatcher:
     """AI-powered job matching engine."""
@@ -17,57 +150,170 @@ class JobMatcher:
     def __init__(self):
         """Initialize the matcher with ML models."""
         # Load Sentence-BERT model for semantic similarity
-        self.sentence_model = SentenceTransformer(settings.SENTENCE_TRANSFORMER_MODEL)
-        
-        # TF-IDF vectorizer for keyword matching
-        self.tfidf_vectorizer = TfidfVectorizer(
-            max_features=500,
-            stop_words='english',
-            ngram_range=(1, 2)
-        )
+        if settings.SENTENCE_TRANSFORMER_BACKEND == "onnx":
+            import onnxruntime
+            
+            # Cap the intra-op thread pool so app workers sharing a host
+            # don't oversubscribe the cores
+            session_options = onnxruntime.SessionOptions()
+            session_options.intra_op_num_threads = settings.SENTENCE_TRANSFORMER_THREADS
+            
+            # int8-quantized ONNX export run by ONNX Runtime (VNNI kernels on x86)
+            self.sentence_model = SentenceTransformer(
+                settings.SENTENCE_TRANSFORMER_MODEL,
+                backend="onnx",
+                model_kwargs={
+                    "file_name": settings.SENTENCE_TRANSFORMER_ONNX_FILE,
+                    "provider": "CPUExecutionProvider",
+                    "session_options": session_options
+                }
+            )
+        else:
+            import torch
+            
+            if settings.SENTENCE_TRANSFORMER_THREADS:
+                torch.set_num_threads(settings.SENTENCE_TRANSFORMER_THREADS)
+            
+            # SentenceTransformer picks CUDA when available; run it in fp16 there
+            self.sentence_model = SentenceTransformer(settings.SENTENCE_TRANSFORMER_MODEL)
+            if settings.USE_FP16 and self.sentence_model.device.type == "cuda":
+                self.sentence_model.half()
+        
+        # Recently encoded texts, keyed by SHA-1 of the text, as int8 vectors
+        # with their scales (a quarter of the float32 size); resume
+        # summaries are re-scored against every job
+        self._emb_cache: LRUCache = LRUCache(maxsize=settings.EMBEDDING_CACHE_SIZE)
+        
+        # When an encoder failure was last logged, and how many were
+        # suppressed since
+        self._error_logged_at = float("-inf")
+        self._suppressed_errors = 0
+    
+    @staticmethod
+    def skill_set(skills: Iterable[str]) -> FrozenSet[str]:
+        """Lowercase a list of skills into a set for overlap scoring."""
+        return frozenset(map(str.lower, skills))
     
     def calculate_skill_match(
         self, 
-        resume_skills: List[str], 
-        job_skills: List[str]
+        resume_skills: Iterable[str], 
+        job_skills: Iterable[str]
     ) -> float:
         """
-        Calculate skill match score using TF-IDF and cosine similarity.
+        Calculate skill match score from the overlap of the two skill sets.
         
         Args:
-            resume_skills: List of skills from resume
-            job_skills: List of required skills for job
+            resume_skills: Skills from resume (a frozenset from skill_set()
+                is used as is)
+            job_skills: Required skills for job (same)
             
         Returns:
             Skill match score (0-1)
         """
+        if not isinstance(resume_skills, frozenset):
+            resume_skills = self.skill_set(resume_skills)
+        if not isinstance(job_skills, frozenset):
+            job_skills = self.skill_set(job_skills)
+        
         if not resume_skills or not job_skills:
             return 0.0
         
-        # Convert to lowercase for comparison
-        resume_skills_lower = [skill.lower() for skill in resume_skills]
-        job_skills_lower = [skill.lower() for skill in job_skills]
+        overlap = len(resume_skills & job_skills)
+        
+        # Share of the required skills the resume covers
+        coverage = overlap / len(job_skills)
+        
+        # Jaccard similarity of the two sets
+        jaccard = overlap / len(resume_skills | job_skills)
         
-        # Exact match count
-        exact_matches = len(set(resume_skills_lower) & set(job_skills_lower))
+        # Weighted combination (favor covering the required skills)
+        return coverage * 0.7 + jaccard * 0.3
+    
+    def encode_quantized(self, texts: List[str], batch_size: int = 64) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Encode texts into int8-quantized Sentence-BERT embeddings.
         
-        # Calculate as percentage of required skills
-        exact_match_score = exact_matches / len(job_skills_lower) if job_skills_lower else 0
+        Texts encoded recently are served from the in-memory cache; the rest
+        are encoded together in one call.
         
-        # TF-IDF similarity
-        try:
-            resume_text = ' '.join(resume_skills_lower)
-            job_text = ' '.join(job_skills_lower)
+        Args:
+            texts: Texts to encode
+            batch_size: Number of texts per forward pass
             
-            tfidf_matrix = self.tfidf_vectorizer.fit_transform([resume_text, job_text])
-            tfidf_score = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-        except Exception:
-            tfidf_score = exact_match_score
+        Returns:
+            Tuple of (int8 array of shape (len(texts), embedding_dim),
+            float32 scales of shape (len(texts),)), as quantize_embeddings
+            returns them
+            
+        Raises:
+            Exception: Whatever the sentence model raised; it is logged
+                here, at most once per ENCODER_ERROR_LOG_INTERVAL
+        """
+        if not texts:
+            return (
+                np.empty((0, settings.EMBEDDING_DIMENSION), dtype=np.int8),
+                np.empty(0, dtype=np.float32)
+            )
+        
+        keys = [hashlib.sha1(text.encode("utf-8")).digest() for text in texts]
+        entries = [self._emb_cache.get(key) for key in keys]
+        
+        missing = [i for i, entry in enumerate(entries) if entry is None]
+        if missing:
+            # Every encode goes through here; failures are logged (rate
+            # limited) and raised rather than scored as dissimilar
+            try:
+                encoded = self.sentence_model.encode(
+                    [texts[i] for i in missing],
+                    batch_size=batch_size,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True
+                )
+            except Exception:
+                self._log_encoder_error()
+                raise
+            quantized, scales = quantize_embeddings(encoded)
+            for i, embedding, scale in zip(missing, quantized, scales):
+                self._emb_cache[keys[i]] = entries[i] = (embedding, scale)
+        
+        return (
+            np.stack([embedding for embedding, _ in entries]),
+            np.array([scale for _, scale in entries], dtype=np.float32)
+        )
+    
+    def _log_encoder_error(self) -> None:
+        """Log the exception being handled, at most once per ENCODER_ERROR_LOG_INTERVAL."""
+        now = time.monotonic()
+        if now - self._error_logged_at < ENCODER_ERROR_LOG_INTERVAL:
+            self._suppressed_errors += 1
+            return
+        
+        logger.warning(
+            "Sentence-BERT encoding failed (%d more failures since the last report)",
+            self._suppressed_errors,
+            exc_info=True
+        )
+        self._error_logged_at = now
+        self._suppressed_errors = 0
+    
+    def encode_texts(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        """
+        Encode texts into L2-normalized Sentence-BERT embeddings.
         
-        # Weighted combination (favor exact matches)
-        final_score = (exact_match_score * 0.7) + (tfidf_score * 0.3)
+        Vectors are reconstructed from the int8 embeddings of
+        encode_quantized() and re-normalized.
         
-        return min(final_score, 1.0)
+        Args:
+            texts: Texts to encode
+            batch_size: Number of texts per forward pass
+            
+        Returns:
+            float32 array of shape (len(texts), embedding_dim)
+        """
+        quantized, _ = self.encode_quantized(texts, batch_size=batch_size)
+        embeddings = quantized.astype(np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return np.divide(embeddings, norms, out=embeddings, where=norms > 0)
     
     def calculate_semantic_similarity(
         self, 
@@ -87,24 +333,18 @@ class JobMatcher:
         if not resume_summary or not job_description:
             return 0.0
         
-        try:
-            # Generate embeddings
-            resume_embedding = self.sentence_model.encode([resume_summary])
-            job_embedding = self.sentence_model.encode([job_description])
-            
-            # Calculate cosine similarity
-            similarity = cosine_similarity(resume_embedding, job_embedding)[0][0]
-            
-            # Normalize to 0-1 range (cosine similarity is already -1 to 1, but typically 0-1)
-            return max(0.0, min(similarity, 1.0))
-        except Exception as e:
-            print(f"Error calculating semantic similarity: {e}")
-            return 0.0
+        # Encode both texts in one pass; normalized, so cosine is a dot product
+        resume_embedding, job_embedding = self.encode_texts([resume_summary, job_description])
+        similarity = float(resume_embedding @ job_embedding)
+        
+        # Normalize to 0-1 range (cosine similarity is already -1 to 1, but typically 0-1)
+        return max(0.0, min(similarity, 1.0))
     
     def calculate_experience_match(
         self, 
         resume_experience: List[Dict[str, Any]], 
-        required_experience: str
+        required_experience: str,
+        resume_years: Optional[float] = None
     ) -> float:
         """
         Calculate experience level compatibility.
@@ -112,6 +352,8 @@ class JobMatcher:
         Args:
             resume_experience: List of experience entries from resume
             required_experience: Required experience string (e.g., "2-5 years")
+            resume_years: Years of experience from the resume's date ranges
+                (optional; parsed resume data's total_experience_years)
             
         Returns:
             Experience match score (0-1)
@@ -119,15 +361,15 @@ class JobMatcher:
         if not resume_experience:
             return 0.0
         
-        # Estimate years of experience from resume
-        resume_years = len(resume_experience)  # Simplified: count positions
+        # Resumes without dated positions fall back to counting positions
+        if resume_years is None:
+            resume_years = len(resume_experience)
         
         if not required_experience:
             return 1.0  # No requirement specified
         
         # Parse required experience
-        import re
-        match = re.search(r'(\d+)[-–](\d+)', required_experience)
+        match = _EXPERIENCE_RANGE_RE.search(required_experience)
         if match:
             min_years = int(match.group(1))
             max_years = int(match.group(2))
@@ -229,7 +471,9 @@ class JobMatcher:
         self,
         resume_data: Dict[str, Any],
         job_data: Dict[str, Any],
-        preferences: Optional[Dict[str, Any]] = None
+        preferences: Optional[Dict[str, Any]] = None,
+        semantic_score: Optional[float] = None,
+        resume_skills: Optional[FrozenSet[str]] = None
     ) -> Dict[str, Any]:
         """
         Calculate comprehensive match score using 3-layer algorithm.
@@ -245,14 +489,19 @@ class JobMatcher:
             resume_data: Parsed resume data
             job_data: Job listing data
             preferences: User preferences (optional)
+            semantic_score: Precomputed semantic similarity (optional),
+                e.g. from stored job embeddings
+            resume_skills: Precomputed skill_set() of the resume (optional)
             
         Returns:
             Dictionary with match score and breakdown
         """
         # Extract resume skills
-        resume_skills = [skill['skill_name'] for skill in resume_data.get('skills', [])]
+        if resume_skills is None:
+            resume_skills = self.skill_set(skill['skill_name'] for skill in resume_data.get('skills', []))
         resume_summary = resume_data.get('summary', '')
         resume_experience = resume_data.get('experience', [])
+        resume_years = resume_data.get('total_experience_years')
         
         # Extract job requirements
         job_skills = job_data.get('required_skills', [])
@@ -269,8 +518,11 @@ class JobMatcher:
         
         # Calculate individual scores
         skill_score = self.calculate_skill_match(resume_skills, job_skills)
-        semantic_score = self.calculate_semantic_similarity(resume_summary, job_description)
-        experience_score = self.calculate_experience_match(resume_experience, required_experience)
+        if semantic_score is None:
+            semantic_score = self.calculate_semantic_similarity(resume_summary, job_description)
+        else:
+            semantic_score = max(0.0, min(semantic_score, 1.0))
+        experience_score = self.calculate_experience_match(resume_experience, required_experience, resume_years)
         location_score = self.calculate_location_match(user_location, job_location)
         salary_score = self.calculate_salary_match(
             user_min_salary, user_max_salary, 
@@ -296,6 +548,215 @@ class JobMatcher:
                 "salary_match": round(salary_score * 100, 2)
             }
         }
+    
+    def score_matrix(
+        self,
+        resume_data: Dict[str, Any],
+        job_list: Union[List[Dict[str, Any]], "JobIndex"],
+        preferences: Optional[Dict[str, Any]] = None,
+        semantic_scores: Optional[List[Optional[float]]] = None
+    ) -> np.ndarray:
+        """
+        Compute every score component for one resume against many jobs.
+        
+        Works on a JobIndex, so each component is a few array operations
+        over all jobs: semantic similarities missing from semantic_scores
+        come from one product of the job embeddings with the resume
+        embedding, skill overlap is a popcount of the job skill bitsets ANDed
+        with the resume's, experience and location are scored once per
+        distinct value and gathered by code, and salary is scored over the
+        salary arrays.
+        
+        Args:
+            resume_data: Parsed resume data
+            job_list: A JobIndex, or job listing data in the shape
+                calculate_match_score takes (indexed here)
+            preferences: User preferences (optional)
+            semantic_scores: Precomputed semantic similarity per job (optional);
+                None entries are computed here
+            
+        Returns:
+            Array of shape (len(SCORE_COMPONENTS), len(job_list)) with scores (0-1)
+        """
+        jobs = job_list if isinstance(job_list, JobIndex) else JobIndex(job_list)
+        n_jobs = len(jobs)
+        scores = np.zeros((len(SCORE_COMPONENTS), n_jobs))
+        if not n_jobs:
+            return scores
+        
+        # Semantic similarity: encode the resume and any jobs without a
+        # precomputed score together, then one batched int8 (N, D) x (D,) cosine
+        semantic = np.array(
+            [np.nan if score is None else score for score in semantic_scores or [None] * n_jobs],
+            dtype=np.float64
+        )
+        resume_summary = resume_data.get('summary')
+        missing = [i for i in np.flatnonzero(np.isnan(semantic)) if jobs.descriptions[i]]
+        if missing and resume_summary:
+            embeddings, _ = self.encode_quantized(
+                [resume_summary] + [jobs.descriptions[i] for i in missing]
+            )
+            semantic[missing] = cosine_similarities(embeddings[1:], embeddings[0])
+        scores[1] = np.clip(np.nan_to_num(semantic, nan=0.0), 0.0, 1.0)
+        
+        # Skill overlap: AND the resume's bitset into every job's and count
+        # the bits left
+        resume_skills = self.skill_set(skill['skill_name'] for skill in resume_data.get('skills', []))
+        if resume_skills:
+            resume_bits = jobs.resume_bits(resume_skills)
+            overlap = popcount_rows(jobs.skill_bits & resume_bits).astype(np.float64)
+            job_counts = jobs.skill_counts
+            has_skills = job_counts > 0
+            coverage = np.divide(overlap, job_counts, out=np.zeros(n_jobs), where=has_skills)
+            jaccard = np.divide(
+                overlap, job_counts + len(resume_skills) - overlap,
+                out=np.zeros(n_jobs), where=has_skills
+            )
+            scores[0] = coverage * 0.7 + jaccard * 0.3
+        
+        # Experience and location: score each distinct job value once and
+        # gather the scores by code
+        resume_experience = resume_data.get('experience', [])
+        resume_years = resume_data.get('total_experience_years')
+        experience_scores = np.array([
+            self.calculate_experience_match(resume_experience, required_experience, resume_years)
+            for required_experience in jobs.experience_values
+        ])
+        scores[2] = experience_scores[jobs.experience_codes]
+        
+        user_location = preferences.get('location') if preferences else None
+        location_scores = np.array([
+            self.calculate_location_match(user_location, job_location)
+            for job_location in jobs.location_values
+        ])
+        scores[3] = location_scores[jobs.location_codes]
+        
+        # Salary: one vectorized pass over the jobs' salary ranges
+        scores[4] = salary_match_scores(
+            preferences.get('min_salary') if preferences else None,
+            preferences.get('max_salary') if preferences else None,
+            jobs.min_salaries,
+            jobs.max_salaries
+        )
+        
+        return scores
+    
+    def score_bulk(
+        self,
+        resume_data: Dict[str, Any],
+        job_list: Union[List[Dict[str, Any]], "JobIndex"],
+        preferences: Optional[Dict[str, Any]] = None,
+        semantic_scores: Optional[List[Optional[float]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Score one resume against many jobs.
+        
+        Same results as calling calculate_match_score for each job, computed
+        from score_matrix() with one weighted sum for all final scores.
+        
+        Args:
+            resume_data: Parsed resume data
+            job_list: A JobIndex, or job listing data in the shape
+                calculate_match_score takes
+            preferences: User preferences (optional)
+            semantic_scores: Precomputed semantic similarity per job (optional);
+                None entries are computed here
+            
+        Returns:
+            Match results in the same order as job_list
+        """
+        scores = self.score_matrix(resume_data, job_list, preferences, semantic_scores)
+        final_scores = (SCORE_WEIGHTS @ scores * 100).round(2).tolist()
+        breakdowns = (scores * 100).round(2).T.tolist()
+        
+        return [
+            {
+                "match_score": final_score,
+                "score_breakdown": dict(zip(SCORE_COMPONENTS, breakdown))
+            }
+            for final_score, breakdown in zip(final_scores, breakdowns)
+        ]
+
+
+class JobIndex:
+    """
+    Structure-of-arrays view of job listings for bulk scoring.
+    
+    Required skills are stored as one bitset per job over a skill
+    vocabulary (bit i set for skill ID i), salaries as float arrays, and
+    experience requirements and locations as codes into their distinct
+    values, so scoring a resume works on contiguous arrays instead of one
+    dict per job. Build it once for a set of jobs; it can be scored
+    against any number of resumes.
+    """
+    
+    def __init__(self, job_list: List[Dict[str, Any]]):
+        """
+        Index a set of jobs.
+        
+        Args:
+            job_list: Job listing data, in the shape
+                JobMatcher.calculate_match_score takes
+        """
+        self.descriptions: List[Optional[str]] = [job.get('description') for job in job_list]
+        
+        # Skills: assign IDs in order of first appearance, then set each
+        # job's bits
+        job_skills = [JobMatcher.skill_set(job.get('required_skills') or []) for job in job_list]
+        self.skill_vocab: Dict[str, int] = {}
+        skill_ids = np.array([
+            self.skill_vocab.setdefault(skill, len(self.skill_vocab))
+            for skills in job_skills for skill in skills
+        ], dtype=np.intp)
+        skill_counts = [len(skills) for skills in job_skills]
+        self.skill_counts = np.array(skill_counts, dtype=np.float64)
+        self.skill_bits = np.zeros((len(job_list), -(-len(self.skill_vocab) // 64)), dtype=np.uint64)
+        np.bitwise_or.at(
+            self.skill_bits,
+            (np.repeat(np.arange(len(job_list)), skill_counts), skill_ids // 64),
+            np.left_shift(np.uint64(1), (skill_ids % 64).astype(np.uint64))
+        )
+        
+        # Experience requirements and locations: codes into distinct values
+        self.experience_values, self.experience_codes = self._factorize(
+            [job.get('experience_required', '') for job in job_list]
+        )
+        self.location_values, self.location_codes = self._factorize(
+            [job.get('location') for job in job_list]
+        )
+        
+        # Salaries, with 0 where unset
+        self.min_salaries = np.array([job.get('salary_min') or 0 for job in job_list], dtype=np.float64)
+        self.max_salaries = np.array([job.get('salary_max') or 0 for job in job_list], dtype=np.float64)
+    
+    def __len__(self) -> int:
+        return len(self.descriptions)
+    
+    @staticmethod
+    def _factorize(values: List[Optional[str]]) -> Tuple[List[Optional[str]], np.ndarray]:
+        """Split values into their distinct values and each value's code."""
+        codes: Dict[Optional[str], int] = {}
+        value_codes = np.array([codes.setdefault(value, len(codes)) for value in values], dtype=np.intp)
+        return list(codes), value_codes
+    
+    def resume_bits(self, resume_skills: FrozenSet[str]) -> np.ndarray:
+        """
+        Build a resume's skill bitset over this index's vocabulary.
+        
+        Args:
+            resume_skills: skill_set() of the resume
+            
+        Returns:
+            uint64 array of shape (W,), matching the rows of skill_bits;
+            skills no job requires are left out
+        """
+        skill_ids = np.array(
+            [self.skill_vocab[skill] for skill in resume_skills if skill in self.skill_vocab],
+            dtype=np.intp
+        )
+        bits = np.zeros(self.skill_bits.shape[1], dtype=np.uint64)
+        np.bitwise_or.at(bits, skill_ids // 64, np.left_shift(np.uint64(1), (skill_ids % 64).astype(np.uint64)))
+        return bits
 
 
 # Global matcher instance
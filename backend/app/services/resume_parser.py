@@ -2,32 +2,86 @@
 Resume parser service using spaCy and transformers.
 Extracts skills, experience, education, and other relevant information from resumes.
 """
+import multiprocessing
 import re
+import threading
+import ahocorasick
 import spacy
-from typing import Dict, List, Any, Optional
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+from typing import Dict, List, Any, Optional, Union
 from datetime import datetime
-import PyPDF2
 import pdfplumber
+import pypdfium2 as pdfium
 from io import BytesIO
+from pathlib import Path
 
 from app.core.config import settings
 
 
+# Patterns used while parsing, compiled once at import
+_DATE_RANGE_RE = re.compile(r'(\d{4})\s*[-–]\s*(\d{4}|present|current)', re.IGNORECASE)
+_DEGREE_RE = re.compile(
+    r'\b(bachelor|b\.s\.|b\.a\.|bs|ba)\b'
+    r'|\b(master|m\.s\.|m\.a\.|ms|ma|mba)\b'
+    r'|\b(phd|ph\.d\.|doctorate)\b'
+    r'|\b(associate|a\.s\.|a\.a\.)\b'
+)
+_YEAR_RE = re.compile(r'\b(19|20)\d{2}\b')
+_CONTACT_RE = re.compile(
+    r'(?P<email>\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b)'
+    r'|(?P<phone>\b\d{3}[-.]?\d{3}[-.]?\d{4}\b)'
+)
+
+
+# PDFium is not thread-safe, even across documents; parsing in the
+# threadpool (RESUME_PARSER_WORKERS=0) must not call it concurrently
+_PDFIUM_LOCK = threading.Lock()
+
+
+def _is_word_char(char: str) -> bool:
+    """Whether a character counts as part of a word (as in regex \\w)."""
+    return char.isalnum() or char == "_"
+
+
 class ResumeParser:
     """Parser for extracting structured data from resumes."""
     
     def __init__(self):
         """Initialize the resume parser with spaCy model."""
         try:
-            self.nlp = spacy.load(settings.SPACY_MODEL)
+            self.nlp = self._load_nlp()
         except OSError:
             # Model not found, download it
             import subprocess
             subprocess.run(["python", "-m", "spacy", "download", settings.SPACY_MODEL])
-            self.nlp = spacy.load(settings.SPACY_MODEL)
+            self.nlp = self._load_nlp()
         
         # Comprehensive skill database (expandable)
         self.skill_database = self._load_skill_database()
+        
+        # All skills compiled into one automaton so a resume is scanned once
+        self.skill_automaton = self._build_skill_automaton()
+    
+    @staticmethod
+    def _load_nlp() -> spacy.language.Language:
+        """
+        Load the spaCy pipeline with only the components the parser uses.
+        
+        Only entities and sentence boundaries are read, so the tagger,
+        dependency parser and lemmatizer are left out; sentences come from
+        the lighter senter component (or a rule-based sentencizer).
+        """
+        nlp = spacy.load(
+            settings.SPACY_MODEL,
+            exclude=["tagger", "parser", "attribute_ruler", "lemmatizer"]
+        )
+        if "senter" in nlp.disabled:
+            nlp.enable_pipe("senter")
+        elif not nlp.has_pipe("senter"):
+            nlp.add_pipe("sentencizer")
+        return nlp
     
     def _load_skill_database(self) -> Dict[str, List[str]]:
         """Load comprehensive skill taxonomy."""
@@ -62,12 +116,28 @@ class ResumeParser:
             ]
         }
     
-    def extract_text_from_pdf(self, file_content: bytes) -> str:
+    def _build_skill_automaton(self) -> ahocorasick.Automaton:
+        """
+        Compile the skill database into an Aho-Corasick automaton.
+        
+        Each skill maps to (position in the taxonomy, skill, category); a
+        skill listed under several categories keeps the first one.
+        """
+        automaton = ahocorasick.Automaton()
+        for category, skills in self.skill_database.items():
+            for skill in skills:
+                if skill not in automaton:
+                    automaton.add_word(skill, (len(automaton), skill, category))
+        automaton.make_automaton()
+        return automaton
+    
+    def extract_text_from_pdf(self, file_content: Union[bytes, str, Path]) -> str:
         """
         Extract text from PDF file.
         
         Args:
-            file_content: PDF file content as bytes
+            file_content: PDF file content as bytes, or a path to the PDF
+                (read directly from disk without loading it into memory)
             
         Returns:
             Extracted text string
@@ -75,23 +145,35 @@ class ResumeParser:
         text = ""
         
         try:
-            # Try pdfplumber first (better for complex layouts)
-            with pdfplumber.open(BytesIO(file_content)) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+            # Try PDFium first (native text extraction, much faster)
+            with _PDFIUM_LOCK:
+                pdf = pdfium.PdfDocument(file_content)
+                try:
+                    # PDFium ends lines with CRLF; the section parsing splits on LF
+                    text = "\n".join(page.get_textpage().get_text_bounded() for page in pdf).replace("\r\n", "\n")
+                finally:
+                    pdf.close()
         except Exception:
-            # Fallback to PyPDF2
+            pass
+        
+        if not text.strip():
+            # Fall back to pdfplumber when PDFium finds no text
             try:
-                pdf_reader = PyPDF2.PdfReader(BytesIO(file_content))
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
+                with pdfplumber.open(self._pdf_source(file_content)) as pdf:
+                    for page in pdf.pages:
+                        page_text = page.extract_text()
+                        if page_text:
+                            text += page_text + "\n"
             except Exception as e:
                 raise ValueError(f"Failed to extract text from PDF: {str(e)}")
         
         return text.strip()
     
+    @staticmethod
+    def _pdf_source(file_content: Union[bytes, str, Path]) -> Union[BytesIO, str, Path]:
+        """Wrap in-memory content for the PDF readers; paths are passed through."""
+        return BytesIO(file_content) if isinstance(file_content, bytes) else file_content
+    
     def extract_skills(self, text: str) -> List[Dict[str, str]]:
         """
         Extract skills from text using skill database.
@@ -103,28 +185,27 @@ class ResumeParser:
             List of skills with categories
         """
         text_lower = text.lower()
-        found_skills = []
+        found_skills = {}
         
-        for category, skills in self.skill_database.items():
-            for skill in skills:
-                # Use word boundaries to avoid partial matches
-                pattern = r'\b' + re.escape(skill) + r'\b'
-                if re.search(pattern, text_lower):
-                    found_skills.append({
-                        "skill_name": skill.title(),
-                        "skill_category": category
-                    })
-        
-        # Remove duplicates
-        unique_skills = []
-        seen = set()
-        for skill in found_skills:
-            key = skill["skill_name"].lower()
-            if key not in seen:
-                seen.add(key)
-                unique_skills.append(skill)
-        
-        return unique_skills
+        # One pass over the text finds every occurrence of every skill
+        for end, (position, skill, category) in self.skill_automaton.iter(text_lower):
+            if position in found_skills:
+                continue
+            
+            # Only whole words count: the match can't continue a word on either side
+            start = end - len(skill) + 1
+            if start > 0 and _is_word_char(text_lower[start - 1]):
+                continue
+            if end + 1 < len(text_lower) and _is_word_char(text_lower[end + 1]):
+                continue
+            
+            found_skills[position] = {
+                "skill_name": skill.title(),
+                "skill_category": category
+            }
+        
+        # Report skills in taxonomy order
+        return [found_skills[position] for position in sorted(found_skills)]
     
     def extract_experience(self, text: str, doc: Any) -> List[Dict[str, Any]]:
         """
@@ -142,10 +223,6 @@ class ResumeParser:
         # Extract organizations using NER
         organizations = [ent.text for ent in doc.ents if ent.label_ == "ORG"]
         
-        # Extract date ranges
-        date_pattern = r'(\d{4})\s*[-–]\s*(\d{4}|present|current)'
-        date_matches = re.finditer(date_pattern, text, re.IGNORECASE)
-        
         # Extract job titles (common patterns)
         title_keywords = [
             "engineer", "developer", "analyst", "manager", "designer", "scientist",
@@ -161,19 +238,59 @@ class ResumeParser:
                 experience = {
                     "title": line.strip(),
                     "company": organizations[len(experiences)] if len(experiences) < len(organizations) else "Unknown",
-                    "duration": None
+                    "duration": None,
+                    "start_year": None,
+                    "end_year": None
                 }
                 
-                # Try to find date range in nearby lines
+                # Try to find date range in nearby lines; "present" ends this year
                 context = ' '.join(lines[max(0, i-1):min(len(lines), i+3)])
-                date_match = re.search(date_pattern, context, re.IGNORECASE)
+                date_match = _DATE_RANGE_RE.search(context)
                 if date_match:
                     experience["duration"] = f"{date_match.group(1)} - {date_match.group(2)}"
+                    experience["start_year"] = int(date_match.group(1))
+                    end = date_match.group(2)
+                    experience["end_year"] = int(end) if end.isdigit() else datetime.utcnow().year
                 
                 experiences.append(experience)
         
         return experiences[:10]  # Limit to 10 most recent
     
+    @staticmethod
+    def total_experience_years(experience: List[Dict[str, Any]]) -> Optional[float]:
+        """
+        Count the years covered by the dated experience entries.
+        
+        Overlapping ranges (concurrent roles, or one range found for
+        several title lines) are counted once.
+        
+        Args:
+            experience: Experience entries from extract_experience
+            
+        Returns:
+            Total years, or None if no entry has a date range
+        """
+        ranges = sorted(
+            (entry["start_year"], entry["end_year"])
+            for entry in experience
+            if entry.get("start_year") is not None and entry["end_year"] >= entry["start_year"]
+        )
+        if not ranges:
+            return None
+        
+        # Merge overlapping ranges and add up their lengths
+        total = 0
+        current_start, current_end = ranges[0]
+        for start, end in ranges[1:]:
+            if start > current_end:
+                total += current_end - current_start
+                current_start, current_end = start, end
+            else:
+                current_end = max(current_end, end)
+        total += current_end - current_start
+        
+        return float(total)
+    
     def extract_education(self, text: str, doc: Any) -> List[Dict[str, Any]]:
         """
         Extract education information from resume.
@@ -187,13 +304,9 @@ class ResumeParser:
         """
         education = []
         
-        # Degree keywords
-        degree_patterns = [
-            r'\b(bachelor|b\.s\.|b\.a\.|bs|ba)\b',
-            r'\b(master|m\.s\.|m\.a\.|ms|ma|mba)\b',
-            r'\b(phd|ph\.d\.|doctorate)\b',
-            r'\b(associate|a\.s\.|a\.a\.)\b'
-        ]
+        # ORG entities from the full-document pass, ordered by offset
+        orgs = [(ent.start_char, ent.end_char, ent.text) for ent in doc.ents if ent.label_ == "ORG"]
+        org_starts = [start for start, _, _ in orgs]
         
         # Field of study keywords
         field_keywords = [
@@ -202,34 +315,35 @@ class ResumeParser:
         ]
         
         lines = text.split('\n')
+        line_starts = list(accumulate((len(line) + 1 for line in lines), initial=0))
         for i, line in enumerate(lines):
             line_lower = line.lower()
             
             # Check for degree
-            for pattern in degree_patterns:
-                if re.search(pattern, line_lower):
-                    edu_entry = {
-                        "degree": line.strip(),
-                        "institution": None,
-                        "year": None
-                    }
-                    
-                    # Try to find institution in nearby lines
-                    context = ' '.join(lines[max(0, i-1):min(len(lines), i+3)])
-                    
-                    # Extract year
-                    year_match = re.search(r'\b(19|20)\d{2}\b', context)
-                    if year_match:
-                        edu_entry["year"] = year_match.group(0)
-                    
-                    # Extract institution (look for ORG entities)
-                    context_doc = self.nlp(context)
-                    orgs = [ent.text for ent in context_doc.ents if ent.label_ == "ORG"]
-                    if orgs:
-                        edu_entry["institution"] = orgs[0]
-                    
-                    education.append(edu_entry)
-                    break
+            if _DEGREE_RE.search(line_lower):
+                edu_entry = {
+                    "degree": line.strip(),
+                    "institution": None,
+                    "year": None
+                }
+                
+                # Try to find institution in nearby lines
+                context = ' '.join(lines[max(0, i-1):min(len(lines), i+3)])
+                
+                # Extract year
+                year_match = _YEAR_RE.search(context)
+                if year_match:
+                    edu_entry["year"] = year_match.group(0)
+                
+                # Extract institution: the first ORG entity within the same
+                # nearby lines, looked up in the document's entities
+                window_start = line_starts[max(0, i-1)]
+                window_end = line_starts[min(len(lines), i+3)] - 1
+                j = bisect_left(org_starts, window_start)
+                if j < len(orgs) and orgs[j][1] <= window_end:
+                    edu_entry["institution"] = orgs[j][2]
+                
+                education.append(edu_entry)
         
         return education
     
@@ -250,17 +364,13 @@ class ResumeParser:
             "location": None
         }
         
-        # Extract email
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        email_match = re.search(email_pattern, text)
-        if email_match:
-            contact["email"] = email_match.group(0)
-        
-        # Extract phone
-        phone_pattern = r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'
-        phone_match = re.search(phone_pattern, text)
-        if phone_match:
-            contact["phone"] = phone_match.group(0)
+        # Extract the first email and phone in one scan of the text
+        for match in _CONTACT_RE.finditer(text):
+            field = match.lastgroup
+            if contact[field] is None:
+                contact[field] = match.group(0)
+                if contact["email"] is not None and contact["phone"] is not None:
+                    break
         
         # Extract location (GPE entities)
         locations = [ent.text for ent in doc.ents if ent.label_ == "GPE"]
@@ -269,26 +379,65 @@ class ResumeParser:
         
         return contact
     
-    def parse(self, file_content: bytes, filename: str) -> Dict[str, Any]:
+    def parse(self, file_content: Union[bytes, str, Path], filename: str) -> Dict[str, Any]:
         """
         Main parsing function to extract all information from resume.
         
         Args:
-            file_content: Resume file content as bytes
+            file_content: Resume file content as bytes, or a path to it
             filename: Original filename
             
         Returns:
             Dictionary with parsed resume data
         """
-        # Extract text
+        return self.parse_text(self.extract_text(file_content, filename))
+    
+    def extract_text(self, file_content: Union[bytes, str, Path], filename: str) -> str:
+        """
+        Extract plain text from a resume file.
+        
+        Args:
+            file_content: Resume file content as bytes, or a path to it
+            filename: Original filename
+            
+        Returns:
+            Extracted text string
+            
+        Raises:
+            ValueError: If the file type is unsupported or unreadable
+        """
         if filename.lower().endswith('.pdf'):
-            text = self.extract_text_from_pdf(file_content)
-        else:
-            raise ValueError("Only PDF files are supported currently")
+            return self.extract_text_from_pdf(file_content)
+        raise ValueError("Only PDF files are supported currently")
+    
+    def parse_path(self, file_path: Union[str, Path], filename: str) -> Dict[str, Any]:
+        """
+        Parse a resume that has already been saved to disk.
         
-        # Process with spaCy
-        doc = self.nlp(text)
+        Args:
+            file_path: Path to the stored resume file
+            filename: Original filename
+            
+        Returns:
+            Dictionary with parsed resume data
+        """
+        return self.parse(Path(file_path), filename)
+    
+    def parse_text(self, text: str) -> Dict[str, Any]:
+        """
+        Extract all information from resume text.
         
+        Args:
+            text: Plain text extracted from the resume
+            
+        Returns:
+            Dictionary with parsed resume data
+        """
+        # Process with spaCy
+        return self._parse_from_doc(text, self.nlp(text))
+    
+    def _parse_from_doc(self, text: str, doc: Any) -> Dict[str, Any]:
+        """Extract all information from resume text and its spaCy Doc."""
         # Extract all components
         skills = self.extract_skills(text)
         experience = self.extract_experience(text, doc)
@@ -303,6 +452,7 @@ class ResumeParser:
             "raw_text": text,
             "skills": skills,
             "experience": experience,
+            "total_experience_years": self.total_experience_years(experience),
             "education": education,
             "contact": contact,
             "summary": summary,
@@ -312,3 +462,26 @@ class ResumeParser:
 
 # Global parser instance
 resume_parser = ResumeParser()
+
+
+def parse_resume_file(file_path: str, filename: str) -> Dict[str, Any]:
+    """Parse a stored resume with the global parser (picklable for process pools)."""
+    return resume_parser.parse_path(file_path, filename)
+
+
+def create_parser_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Start a process pool to run parse_resume_file on.
+    
+    Returns:
+        The pool, or None when RESUME_PARSER_WORKERS is 0 and parsing runs
+        in the threadpool
+    """
+    if settings.RESUME_PARSER_WORKERS <= 0:
+        return None
+    
+    # Spawned, since forking a threaded server is unsafe
+    return ProcessPoolExecutor(
+        max_workers=settings.RESUME_PARSER_WORKERS,
+        mp_context=multiprocessing.get_context("spawn")
+    )
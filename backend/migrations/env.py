@@ -0,0 +1,59 @@
+"""
+Alembic environment: runs the migrations on the app's database engine.
+"""
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.db.database import Base, acquire_startup_lock, engine
+# Import every model so all tables are registered on Base.metadata
+from app import models
+
+
+config = context.config
+
+
+def run_migrations(connection) -> None:
+    """Run the migrations on a sync connection."""
+    context.configure(connection=connection, target_metadata=Base.metadata, compare_type=True)
+    
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_offline() -> None:
+    """Emit the migrations as SQL instead of running them (alembic --sql)."""
+    context.configure(
+        url=engine.url.render_as_string(hide_password=False),
+        target_metadata=Base.metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"}
+    )
+    
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online() -> None:
+    """Run the migrations on a new connection from the app's async engine."""
+    async with engine.begin() as conn:
+        # Don't migrate while app workers are starting up
+        await acquire_startup_lock(conn)
+        await conn.run_sync(run_migrations)
+    
+    await engine.dispose()
+
+
+connection = config.attributes.get("connection")
+if connection is not None:
+    # Called by init_db on the app's startup connection
+    run_migrations(connection)
+else:
+    if config.config_file_name is not None:
+        fileConfig(config.config_file_name)
+    
+    if context.is_offline_mode():
+        run_migrations_offline()
+    else:
+        asyncio.run(run_migrations_online())
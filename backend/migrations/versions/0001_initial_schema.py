@@ -0,0 +1,164 @@
+"""
+Initial schema, as created by Base.metadata.create_all before migrations.
+
+Databases created that way are stamped with this revision on startup
+(see init_db) instead of running it.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-15
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("password_hash", sa.String(), nullable=False),
+        sa.Column("full_name", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("company", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("location", sa.String(), nullable=True),
+        sa.Column("salary_min", sa.Integer(), nullable=True),
+        sa.Column("salary_max", sa.Integer(), nullable=True),
+        sa.Column("experience_required", sa.String(), nullable=True),
+        sa.Column("required_skills", postgresql.JSONB(), nullable=True),
+        sa.Column("source", sa.String(), nullable=True),
+        sa.Column("external_url", sa.String(), nullable=True),
+        sa.Column("posted_at", sa.DateTime(), nullable=True),
+        sa.Column("scraped_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_jobs_location", "jobs", ["location"])
+    op.create_index("ix_jobs_posted_at", "jobs", ["posted_at"])
+    op.create_index("ix_jobs_title", "jobs", ["title"])
+    
+    op.create_table(
+        "job_skills",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("job_id", sa.UUID(), nullable=False),
+        sa.Column("skill_name", sa.String(), nullable=False),
+        sa.Column("is_required", sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(["job_id"], ["jobs.id"]),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_job_skills_job_id", "job_skills", ["job_id"])
+    
+    op.create_table(
+        "resumes",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("file_url", sa.String(), nullable=False),
+        sa.Column("raw_text", sa.Text(), nullable=True),
+        sa.Column("parsed_data", postgresql.JSONB(), nullable=True),
+        sa.Column("uploaded_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_resumes_user_id", "resumes", ["user_id"])
+    
+    op.create_table(
+        "resume_skills",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("resume_id", sa.UUID(), nullable=False),
+        sa.Column("skill_name", sa.String(), nullable=False),
+        sa.Column("skill_category", sa.String(), nullable=True),
+        sa.Column("proficiency_level", sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(["resume_id"], ["resumes.id"]),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_resume_skills_resume_id", "resume_skills", ["resume_id"])
+    
+    op.create_table(
+        "preferences",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("desired_role", sa.String(), nullable=True),
+        sa.Column("desired_skills", postgresql.JSONB(), nullable=True),
+        sa.Column("experience_level", sa.String(), nullable=True),
+        sa.Column("location", sa.String(), nullable=True),
+        sa.Column("min_salary", sa.String(), nullable=True),
+        sa.Column("max_salary", sa.String(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_preferences_user_id", "preferences", ["user_id"], unique=True)
+    
+    op.create_table(
+        "matches",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("job_id", sa.UUID(), nullable=False),
+        sa.Column("match_score", sa.Float(), nullable=False),
+        sa.Column("score_breakdown", postgresql.JSONB(), nullable=True),
+        sa.Column("calculated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["job_id"], ["jobs.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_matches_calculated_at", "matches", ["calculated_at"])
+    op.create_index("ix_matches_job_id", "matches", ["job_id"])
+    op.create_index("ix_matches_user_id", "matches", ["user_id"])
+    
+    op.create_table(
+        "applications",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("job_id", sa.UUID(), nullable=False),
+        sa.Column("status", sa.String(), nullable=True),
+        sa.Column("applied_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["job_id"], ["jobs.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_applications_job_id", "applications", ["job_id"])
+    op.create_index("ix_applications_user_id", "applications", ["user_id"])
+    
+    op.create_table(
+        "saved_jobs",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("job_id", sa.UUID(), nullable=False),
+        sa.Column("saved_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["job_id"], ["jobs.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_saved_jobs_job_id", "saved_jobs", ["job_id"])
+    op.create_index("ix_saved_jobs_user_id", "saved_jobs", ["user_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("saved_jobs")
+    op.drop_table("applications")
+    op.drop_table("matches")
+    op.drop_table("preferences")
+    op.drop_table("resume_skills")
+    op.drop_table("resumes")
+    op.drop_table("job_skills")
+    op.drop_table("jobs")
+    op.drop_table("users")
@@ -0,0 +1,112 @@
+"""
+Unique (user, job) pairs, job embeddings, resume dedup and parse status.
+
+- matches, saved_jobs and applications get unique (user_id, job_id)
+  constraints for their ON CONFLICT upserts; duplicate pairs are removed
+  first.
+- jobs get a pgvector embedding column with an HNSW cosine index.
+- resumes get content_sha256 (unique per user) and parse_status, and are
+  indexed by (user_id, uploaded_at) instead of user_id alone.
+- preferences store salaries as integers.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+from app.core.config import settings
+
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep one row per (user, job) before making the pairs unique: the
+    # latest match, the first save and the most recently updated application
+    op.execute(
+        "DELETE FROM matches AS m USING matches AS kept "
+        "WHERE kept.user_id = m.user_id AND kept.job_id = m.job_id "
+        "AND (kept.calculated_at, kept.id) > (m.calculated_at, m.id)"
+    )
+    op.execute(
+        "DELETE FROM saved_jobs AS s USING saved_jobs AS kept "
+        "WHERE kept.user_id = s.user_id AND kept.job_id = s.job_id "
+        "AND (kept.saved_at, kept.id) < (s.saved_at, s.id)"
+    )
+    op.execute(
+        "DELETE FROM applications AS a USING applications AS kept "
+        "WHERE kept.user_id = a.user_id AND kept.job_id = a.job_id "
+        "AND (kept.updated_at, kept.id) > (a.updated_at, a.id)"
+    )
+    op.create_unique_constraint("uq_matches_user_job", "matches", ["user_id", "job_id"])
+    op.create_unique_constraint("uq_saved_jobs_user_job", "saved_jobs", ["user_id", "job_id"])
+    op.create_unique_constraint("uq_applications_user_job", "applications", ["user_id", "job_id"])
+    op.create_index("ix_matches_user_job_calculated", "matches", ["user_id", "job_id", "calculated_at"])
+    
+    # Job embeddings are stored with the pgvector extension; missing ones
+    # are backfilled at startup
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    op.add_column("jobs", sa.Column("embedding", Vector(settings.EMBEDDING_DIMENSION), nullable=True))
+    op.create_index(
+        "ix_jobs_embedding_hnsw",
+        "jobs",
+        ["embedding"],
+        postgresql_using="hnsw",
+        postgresql_with={"m": 16, "ef_construction": 64},
+        postgresql_ops={"embedding": "vector_cosine_ops"}
+    )
+    
+    # Existing resumes were parsed during their upload, so they start out
+    # "parsed"; their files predate hashing, so content_sha256 stays empty
+    op.add_column("resumes", sa.Column("content_sha256", sa.String(length=64), nullable=True))
+    op.add_column("resumes", sa.Column("parse_status", sa.String(), nullable=False, server_default="parsed"))
+    op.alter_column("resumes", "parse_status", server_default=None)
+    op.create_index("ix_resumes_content_sha256", "resumes", ["content_sha256"])
+    op.create_unique_constraint("uq_resumes_user_sha256", "resumes", ["user_id", "content_sha256"])
+    op.create_index("ix_resumes_user_uploaded", "resumes", ["user_id", "uploaded_at"])
+    op.drop_index("ix_resumes_user_id", table_name="resumes")
+    
+    # The API only ever accepted integers, so the stored strings all cast
+    op.alter_column(
+        "preferences",
+        "min_salary",
+        type_=sa.Integer(),
+        existing_type=sa.String(),
+        postgresql_using="min_salary::integer"
+    )
+    op.alter_column(
+        "preferences",
+        "max_salary",
+        type_=sa.Integer(),
+        existing_type=sa.String(),
+        postgresql_using="max_salary::integer"
+    )
+
+
+def downgrade() -> None:
+    # Removed duplicate rows are not restored
+    op.alter_column("preferences", "max_salary", type_=sa.String(), existing_type=sa.Integer())
+    op.alter_column("preferences", "min_salary", type_=sa.String(), existing_type=sa.Integer())
+    
+    op.create_index("ix_resumes_user_id", "resumes", ["user_id"])
+    op.drop_index("ix_resumes_user_uploaded", table_name="resumes")
+    op.drop_constraint("uq_resumes_user_sha256", "resumes", type_="unique")
+    op.drop_index("ix_resumes_content_sha256", table_name="resumes")
+    op.drop_column("resumes", "parse_status")
+    op.drop_column("resumes", "content_sha256")
+    
+    op.drop_index("ix_jobs_embedding_hnsw", table_name="jobs")
+    op.drop_column("jobs", "embedding")
+    
+    op.drop_index("ix_matches_user_job_calculated", table_name="matches")
+    op.drop_constraint("uq_applications_user_job", "applications", type_="unique")
+    op.drop_constraint("uq_saved_jobs_user_job", "saved_jobs", type_="unique")
+    op.drop_constraint("uq_matches_user_job", "matches", type_="unique")
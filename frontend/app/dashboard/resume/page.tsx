@@ -5,6 +5,9 @@ import { useRouter } from 'next/navigation';
 import { API_ENDPOINTS } from '@/lib/config';
 import { apiClient } from '@/lib/api-client';
 
+// Seconds to wait for a background parse before giving up
+const MAX_PARSE_POLLS = 120;
+
 export default function ResumePage() {
     const router = useRouter();
     const [file, setFile] = useState<File | null>(null);
@@ -52,11 +55,24 @@ export default function ResumePage() {
                 body: formData,
             });
 
+            const data = await response.json();
             if (!response.ok) {
-                const data = await response.json();
                 throw new Error(data.detail || 'Upload failed');
             }
 
+            // Parsing runs in the background; wait for it to finish, but not forever
+            let resume = data;
+            for (let attempt = 0; resume.parse_status === 'pending'; attempt++) {
+                if (attempt >= MAX_PARSE_POLLS) {
+                    throw new Error('Parsing is taking longer than expected. Please try uploading again.');
+                }
+                await new Promise((resolve) => setTimeout(resolve, 1000));
+                resume = await apiClient.get(`${API_ENDPOINTS.resumes}/${resume.id}`);
+            }
+            if (resume.parse_status === 'failed') {
+                throw new Error('Failed to parse resume');
+            }
+
             setSuccess(true);
             setTimeout(() => {
                 router.push('/dashboard');